@@ -7,18 +7,21 @@ and generating role-aligned summaries.
 
 __version__ = "1.0.0"
 
-from .config import ROLE_DEFINITIONS, FEW_SHOT_EXAMPLES
+from .config import ROLE_DEFINITIONS, ROLE_DEFINITION_LENGTHS, FEW_SHOT_EXAMPLES
 from .scorer import SemanticRoleScorer
 from .generator import SummaryGenerator
 from .pipeline import RoleColorPipeline
-from .utils import load_resume_from_file, export_sentence_scores
+from .utils import load_resume_from_file, export_sentence_scores, read_json, write_json
 
 __all__ = [
     'ROLE_DEFINITIONS',
+    'ROLE_DEFINITION_LENGTHS',
     'FEW_SHOT_EXAMPLES',
     'SemanticRoleScorer',
     'SummaryGenerator',
     'RoleColorPipeline',
     'load_resume_from_file',
     'export_sentence_scores',
+    'read_json',
+    'write_json',
 ]
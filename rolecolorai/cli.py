@@ -6,8 +6,10 @@ Provides CLI entry point for RoleColorAI.
 
 import sys
 import os
-import json
 import argparse
+import hashlib
+from pathlib import Path
+from typing import Dict
 
 try:
     from dotenv import load_dotenv
@@ -15,8 +17,76 @@ try:
 except ImportError:
     pass
 
+from . import __version__
+from .config import CACHE_DIR, CONFIG_FINGERPRINT
+from .generator import GENERATION_FINGERPRINT
 from .pipeline import RoleColorPipeline
-from .utils import load_resume_from_file, export_sentence_scores
+from .utils import load_resume_from_file, export_sentence_scores, read_json, write_json
+
+
+# Default sample resume analyzed when no resume file is given
+SAMPLE_RESUME = """
+    Senior Software Engineer
+    
+    Summary:
+    Software engineer with 5 years of experience in backend development and APIs.
+    
+    Experience:
+    
+    Senior Software Engineer, TechCorp (2022-Present)
+    - Designed and implemented microservices architecture serving 10 million daily users
+    - Established technical standards and best practices across engineering organization
+    - Built distributed systems from scratch using event-driven patterns and Kafka
+    - Led strategic decisions on technology stack evolution and infrastructure roadmap
+    - Reduced system latency by 60% through architectural improvements
+    
+    Software Engineer, StartupXYZ (2020-2022)
+    - Developed RESTful APIs handling 1M+ requests per day
+    - Collaborated with product and design teams to deliver new features
+    - Maintained legacy systems ensuring 99.9% uptime
+    - Implemented comprehensive testing and monitoring solutions
+    
+    Skills:
+    Python, Java, AWS, Docker, Kubernetes, PostgreSQL, Redis, Kafka, Microservices
+    """
+
+
+def _sample_cache_path(generation_mode: str) -> Path:
+    """Location of the cached analysis for SAMPLE_RESUME under the current config and code"""
+    # The package version covers code changes that no setting or prompt reflects
+    cache_key = hashlib.blake2b(repr((
+        SAMPLE_RESUME,
+        __version__,
+        CONFIG_FINGERPRINT,
+        GENERATION_FINGERPRINT,
+        generation_mode,
+    )).encode()).hexdigest()[:16]
+    return Path(CACHE_DIR).expanduser() / f"sample_analysis_{cache_key}.json"
+
+
+def _write_sample_cache(result: Dict, sample_cache: Path):
+    """Write the sample analysis atomically, so readers never see a partial file"""
+    tmp_path = sample_cache.with_name(f"{sample_cache.name}.{os.getpid()}.tmp")
+    try:
+        sample_cache.parent.mkdir(parents=True, exist_ok=True)
+        write_json(result, str(tmp_path))
+        os.replace(tmp_path, sample_cache)
+    except OSError:
+        # The cache is only a shortcut; the analysis itself was already saved
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _save_result(result: Dict, output_name: str, verbose: bool):
+    """Save analysis result to output/, plus sentence scores in verbose mode"""
+    os.makedirs('output', exist_ok=True)
+    output_file = f'output/{output_name}.json'
+    write_json(result, output_file)
+    print(f"\n💾 Results saved to: {output_file}")
+    
+    # Export sentence scores separately if verbose
+    if verbose and 'sentence_scores' in result and result['sentence_scores']:
+        export_sentence_scores(result, f'output/{output_name}_sentence_scores.json')
 
 
 def main():
@@ -29,13 +99,14 @@ Examples:
   %(prog)s sample_resumes/builder_resume.txt
   %(prog)s sample_resumes/builder_resume.txt --verbose
   %(prog)s sample_resumes/builder_resume.txt -v -o custom_output.json
+  %(prog)s sample_resumes/
         """
     )
     
     parser.add_argument(
         'resume_file',
         nargs='?',
-        help='Path to resume text file (optional, uses default sample if not provided)'
+        help='Path to resume text file or directory of .txt resumes (optional, uses default sample if not provided)'
     )
     
     parser.add_argument(
@@ -54,6 +125,24 @@ Examples:
         help='OpenAI API key (overrides OPENAI_API_KEY environment variable)'
     )
     
+    parser.add_argument(
+        '--batch-api',
+        action='store_true',
+        help='Directory mode only: generate LLM summaries via the OpenAI Batch API (50%% cheaper, slower)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass on-disk caches: re-run the default sample analysis and skip the embedding cache'
+    )
+    
+    parser.add_argument(
+        '--no-table',
+        action='store_true',
+        help='Skip the per-sentence score table (it is skipped automatically when output is piped)'
+    )
+    
     parser.add_argument(
         '--quiet',
         action='store_true',
@@ -61,9 +150,26 @@ Examples:
     )
     
     args = parser.parse_args()
+    show_table = False if args.no_table else None
     
-    # Load resume
-    if args.resume_file:
+    # Load resume(s)
+    resume_files = None
+    if args.resume_file and os.path.isdir(args.resume_file):
+        resume_files = sorted(
+            os.path.join(args.resume_file, name)
+            for name in os.listdir(args.resume_file)
+            if name.endswith('.txt')
+        )
+        if not resume_files:
+            print(f"❌ Error: No .txt resumes found in: {args.resume_file}")
+            sys.exit(1)
+        
+        try:
+            resume_texts = [load_resume_from_file(path) for path in resume_files]
+        except Exception as e:
+            print(f"❌ Error loading resume: {e}")
+            sys.exit(1)
+    elif args.resume_file:
         if not os.path.exists(args.resume_file):
             print(f"❌ Error: File not found: {args.resume_file}")
             sys.exit(1)
@@ -76,35 +182,28 @@ Examples:
             sys.exit(1)
     else:
         # Default sample resume
-        resume_text = """
-    Senior Software Engineer
-    
-    Summary:
-    Software engineer with 5 years of experience in backend development and APIs.
-    
-    Experience:
-    
-    Senior Software Engineer, TechCorp (2022-Present)
-    - Designed and implemented microservices architecture serving 10 million daily users
-    - Established technical standards and best practices across engineering organization
-    - Built distributed systems from scratch using event-driven patterns and Kafka
-    - Led strategic decisions on technology stack evolution and infrastructure roadmap
-    - Reduced system latency by 60% through architectural improvements
-    
-    Software Engineer, StartupXYZ (2020-2022)
-    - Developed RESTful APIs handling 1M+ requests per day
-    - Collaborated with product and design teams to deliver new features
-    - Maintained legacy systems ensuring 99.9% uptime
-    - Implemented comprehensive testing and monitoring solutions
-    
-    Skills:
-    Python, Java, AWS, Docker, Kubernetes, PostgreSQL, Redis, Kafka, Microservices
-    """
+        resume_text = SAMPLE_RESUME
         output_name = args.output or "sample_analysis"
     
     # Get API key
     api_key = args.api_key or os.getenv('OPENAI_API_KEY')
     
+    # The default sample is deterministic, so reuse its cached analysis when present
+    sample_cache = None
+    generation_mode = 'llm' if api_key else 'template'
+    if not args.resume_file:
+        sample_cache = _sample_cache_path(generation_mode)
+        if sample_cache.exists() and not args.no_cache:
+            try:
+                result = read_json(sample_cache)
+            except (OSError, ValueError):
+                # Unreadable or truncated cache: treat as a miss and re-analyze
+                result = None
+            if result is not None:
+                RoleColorPipeline.print_results(result, verbose=args.verbose, show_table=show_table)
+                _save_result(result, output_name, args.verbose)
+                return
+    
     # Initialize pipeline
     verbose_init = not args.quiet
     if api_key and verbose_init:
@@ -112,25 +211,36 @@ Examples:
     elif verbose_init:
         print("ℹ No OPENAI_API_KEY found. Using template-based generation (free).\n")
     
-    pipeline = RoleColorPipeline(api_key=api_key, verbose=verbose_init)
+    pipeline = RoleColorPipeline(
+        api_key=api_key,
+        verbose=verbose_init,
+        cache_dir=None if args.no_cache else CACHE_DIR
+    )
     
     try:
+        if resume_files:
+            # Batch mode: summaries for the whole directory are generated concurrently
+            results = pipeline.analyze_resumes(resume_texts, use_batch_api=args.batch_api)
+            
+            for path, result in zip(resume_files, results):
+                print(f"\n📄 {path}")
+                pipeline.print_results(result, verbose=args.verbose, show_table=show_table)
+                _save_result(result, os.path.splitext(os.path.basename(path))[0], args.verbose)
+            return
+        
         # Analyze resume
         result = pipeline.analyze_resume(resume_text)
         
         # Print results
-        pipeline.print_results(result, verbose=args.verbose)
+        pipeline.print_results(result, verbose=args.verbose, show_table=show_table)
         
         # Save to JSON
-        os.makedirs('output', exist_ok=True)
-        output_file = f'output/{output_name}.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        print(f"\n💾 Results saved to: {output_file}")
+        _save_result(result, output_name, args.verbose)
         
-        # Export sentence scores separately if verbose
-        if args.verbose and 'sentence_scores' in result and result['sentence_scores']:
-            export_sentence_scores(result, f'output/{output_name}_sentence_scores.json')
+        # Only cache what the key promises: an LLM run that fell back to the
+        # template must not be served later as the LLM analysis
+        if sample_cache is not None and result.get('generation_method') == generation_mode:
+            _write_sample_cache(result, sample_cache)
         
     except KeyboardInterrupt:
         print("\n\n⚠ Interrupted by user")
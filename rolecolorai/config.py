@@ -4,7 +4,13 @@ Configuration and constants for RoleColorAI
 Contains role definitions and few-shot examples used throughout the system.
 """
 
-ROLE_DEFINITIONS = {
+import hashlib
+import sys
+from types import MappingProxyType
+
+# Definitions are stripped once at import so consumers can use them as-is.
+# Role names are interned and the mapping is exposed read-only (see below).
+ROLE_DEFINITIONS = {sys.intern(k): v.strip() for k, v in {
     'Builder': """Creates innovative solutions and drives strategic vision. 
     Architects scalable systems and establishes technical direction. 
     Focuses on long-term product thinking and builds foundational infrastructure.""",
@@ -20,7 +26,11 @@ ROLE_DEFINITIONS = {
     'Supportee': """Ensures reliability and maintains critical systems. 
     Documents processes and establishes quality standards. 
     Provides consistent support and operational excellence."""
-}
+}.items()}
+ROLE_DEFINITIONS = MappingProxyType(ROLE_DEFINITIONS)
+
+# Length of each (stripped) role definition, in ROLE_DEFINITIONS order
+ROLE_DEFINITION_LENGTHS = tuple(len(definition) for definition in ROLE_DEFINITIONS.values())
 
 FEW_SHOT_EXAMPLES = {
     'Builder': [
@@ -49,6 +59,14 @@ FEW_SHOT_EXAMPLES = {
 DEFAULT_MODEL = 'all-mpnet-base-v2'
 DEFAULT_LLM_MODEL = 'gpt-4o-mini'
 
+# LLM pricing in USD per token (input, output)
+GPT4O_MINI_COST_IN = 0.15e-6
+GPT4O_MINI_COST_OUT = 0.60e-6
+MODEL_COSTS = {
+    'gpt-4o-mini': (GPT4O_MINI_COST_IN, GPT4O_MINI_COST_OUT),
+    'gpt-4o': (2.5e-6, 10e-6),
+}
+
 # Scoring configuration
 ATTENTION_TOP_PERCENT = 0.3
 ATTENTION_MID_PERCENT = 0.7
@@ -56,9 +74,44 @@ ATTENTION_TOP_WEIGHT = 2.0
 ATTENTION_MID_WEIGHT = 1.0
 ATTENTION_BOTTOM_WEIGHT = 0.5
 SOFTMAX_TEMPERATURE = 1.2
+EMBEDDING_BATCH_SIZE = 128
+SCORE_CACHE_SIZE = 128
+ORIGINAL_SUMMARY_CACHE_SIZE = 512
 
 # LLM configuration
 LLM_MIN_CONFIDENCE = 0.3
 LLM_MAX_TOKENS = 300
 LLM_TEMPERATURE = 0.7
 RESUME_EXTRACT_MAX_WORDS = 400
+LLM_MAX_CONCURRENCY = 8
+LLM_RETRY_ATTEMPTS = 3
+LLM_SUMMARY_CACHE_SIZE = 256
+LLM_CACHED_INPUT_DISCOUNT = 0.5
+
+# OpenAI Batch API configuration (offline runs, 50% token discount)
+LLM_BATCH_COMPLETION_WINDOW = '24h'
+LLM_BATCH_POLL_INTERVAL = 30
+LLM_BATCH_COST_DISCOUNT = 0.5
+
+# On-disk cache location
+CACHE_DIR = '~/.cache/rolecolorai'
+# Embedding cache entries (~1 KB each) before the cache is reset
+EMBEDDING_CACHE_MAX_ENTRIES = 200_000
+
+# Fingerprint of every setting that affects analysis output, used to key on-disk caches
+CONFIG_FINGERPRINT = hashlib.blake2b(repr((
+    sorted(ROLE_DEFINITIONS.items()),
+    sorted(FEW_SHOT_EXAMPLES.items()),
+    DEFAULT_MODEL,
+    DEFAULT_LLM_MODEL,
+    ATTENTION_TOP_PERCENT,
+    ATTENTION_MID_PERCENT,
+    ATTENTION_TOP_WEIGHT,
+    ATTENTION_MID_WEIGHT,
+    ATTENTION_BOTTOM_WEIGHT,
+    SOFTMAX_TEMPERATURE,
+    LLM_MIN_CONFIDENCE,
+    LLM_MAX_TOKENS,
+    LLM_TEMPERATURE,
+    RESUME_EXTRACT_MAX_WORDS,
+)).encode(), digest_size=8).hexdigest()
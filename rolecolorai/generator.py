@@ -5,9 +5,19 @@ Provides LLM-powered and template-based summary generation
 for RoleColor-aligned resume summaries.
 """
 
+import asyncio
+import hashlib
 import json
+import numpy as np
+import os
 import re
-from typing import Dict, Optional
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from .config import (
     ROLE_DEFINITIONS,
@@ -15,9 +25,182 @@ from .config import (
     LLM_MIN_CONFIDENCE,
     LLM_MAX_TOKENS,
     LLM_TEMPERATURE,
-    RESUME_EXTRACT_MAX_WORDS
+    RESUME_EXTRACT_MAX_WORDS,
+    LLM_MAX_CONCURRENCY,
+    LLM_BATCH_COMPLETION_WINDOW,
+    LLM_BATCH_POLL_INTERVAL,
+    LLM_BATCH_COST_DISCOUNT,
+    LLM_SUMMARY_CACHE_SIZE,
+    LLM_CACHED_INPUT_DISCOUNT,
+    LLM_RETRY_ATTEMPTS,
+    MODEL_COSTS
 )
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+try:
+    import msgspec
+    
+    class LLMResponse(msgspec.Struct):
+        """Typed shape of the LLM's JSON reply, validated while decoding"""
+        # Only the summary is used; other keys (e.g. tone) are ignored whatever their type
+        summary: str
+except ImportError:
+    msgspec = None
+
+
+# Per-token prices for the configured model, resolved once at import; models
+# missing from the price table are estimated at gpt-4o-mini rates
+_COST_IN, _COST_OUT = MODEL_COSTS.get(DEFAULT_LLM_MODEL, MODEL_COSTS['gpt-4o-mini'])
+
+# Skills recognized in resumes for metadata extraction
+COMMON_SKILLS = frozenset({
+    'python', 'java', 'javascript', 'react', 'node', 'aws', 'docker',
+    'kubernetes', 'sql', 'machine learning', 'data science', 'api',
+    'go', 'postgresql', 'redis', 'kafka', 'graphql', 'microservices'
+})
+
+# Display form of each skill: "python" -> "Python", "machine learning" -> "Machine Learning"
+_SKILL_CANON = {
+    skill: ' '.join(word.capitalize() for word in skill.split())
+    for skill in COMMON_SKILLS
+}
+
+# Compiled once at import; longest skills first so multi-word skills win the alternation
+_SKILLS_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, sorted(COMMON_SKILLS, key=len, reverse=True))) + r')\b',
+    re.IGNORECASE
+)
+
+
+def _build_skill_automaton():
+    """Aho-Corasick automaton over COMMON_SKILLS, or None without pyahocorasick"""
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for skill, canon in _SKILL_CANON.items():
+        automaton.add_word(skill, (len(skill), canon))
+    automaton.make_automaton()
+    return automaton
+
+
+# Single-pass multi-pattern matcher; _SKILLS_RE is used when unavailable
+_SKILL_AC = _build_skill_automaton()
+
+_YEARS_RE = re.compile(r'(\d+)\+?\s*years?', re.IGNORECASE)
+_TITLE_RE = re.compile(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}$')
+
+
+# Predefined templates - written in first person, natural resume style.
+# Built once at import; only the metadata slots are filled per resume.
+_TEMPLATES = {
+    'Builder': (
+        "Experienced {title} {years_prefix} in architecting scalable systems "
+        "and driving technical vision. "
+        "Leverage a strong background in {skills} to transform abstract concepts into foundational "
+        "infrastructure that supports organizational growth. "
+        "Have a proven track record of designing long-term solutions and building frameworks that scale "
+        "with evolving business needs, consistently delivering innovative approaches to complex technical challenges."
+    ),
+    'Enabler': (
+        "{title_display} {years_prefix} in cross-functional collaboration and "
+        "bridging gaps between technical and business stakeholders. "
+        "Use expertise in {skills} to coordinate complex initiatives across multiple teams and "
+        "unblock critical paths, delivering measurable results. "
+        "Facilitate seamless collaboration and enable high-performing teams through effective communication "
+        "and strategic execution."
+    ),
+    'Thriver': (
+        "{title} {years_prefix} thriving in fast-paced, dynamic environments "
+        "where rapid adaptation is essential. "
+        "Leverage technical expertise in {skills} to rapidly iterate and ship high-quality solutions "
+        "under tight deadlines while maintaining delivery standards. "
+        "Deliver exceptional results even under pressure and uncertainty, consistently demonstrating "
+        "the ability to pivot quickly and adapt to changing requirements."
+    ),
+    'Supportee': (
+        "{title} {years_prefix} focused on reliability and operational excellence "
+        "through rigorous processes and attention to detail. "
+        "Apply deep expertise in {skills} to maintain critical systems and ensure consistent quality "
+        "through comprehensive documentation and standardized procedures. "
+        "Committed to operational excellence with a proven track record of implementing standards that "
+        "reduce risk and improve system stability."
+    ),
+}
+
+# Generic template for roles added to ROLE_DEFINITIONS without a dedicated one
+_FALLBACK_TEMPLATE = (
+    "Experienced {title} {years_prefix}, demonstrating strong alignment "
+    "with {role} principles through professional work. "
+    "Leverage skills in {skills} to apply {role_lower} approaches and deliver "
+    "consistent value. "
+    "Committed to excellence with a track record of meaningful contributions."
+)
+
+
+# Everything in the prompt that doesn't depend on the resume, sent as the system
+# message so it forms an identical prefix across requests. At ~350 tokens it is
+# below OpenAI's 1024-token prompt-caching minimum, so it is kept short rather
+# than padded: only the dominant role's definition goes in the user message.
+_STATIC_SYSTEM_PROMPT = """You are an expert career coach and resume writer. You rewrite resume summaries for candidates identified with a RoleColor role.
+
+Return a JSON object with this exact structure:
+{
+  "summary": "A cohesive, flowing paragraph (4-6 sentences) that reads naturally, not like a list",
+  "tone": "professional|strategic|dynamic|reliable"
+}
+
+CRITICAL REQUIREMENTS:
+1. Write in **FIRST PERSON** (use "I" or action verbs without pronouns) - this is a resume, the candidate wrote it themselves
+2. Write a **cohesive, flowing paragraph** - NOT a list of bullet points or separate sentences
+3. Use natural transitions between sentences (e.g., "Leveraging...", "Through...", "Additionally...")
+4. Integrate skills naturally into sentences rather than listing them separately (e.g., "Building scalable APIs with Python and AWS" NOT "Skills: Python, AWS")
+5. Use language specific to the candidate's role, taken from the role definition given with the resume
+6. Include 1-2 quantified achievements if available in the experience
+7. Professional, confident tone - avoid jargon and phrases like "This professional is recognized for..." (sounds like someone else wrote it)
+8. Based ONLY on provided information (no hallucination)
+9. The summary should read like the candidate wrote it themselves, not like a third-party description
+10. Return valid JSON only"""
+
+# Fingerprint of the prompt and template text, so cached analyses change with them
+GENERATION_FINGERPRINT = hashlib.blake2b(repr((
+    _STATIC_SYSTEM_PROMPT,
+    sorted(_TEMPLATES.items()),
+    _FALLBACK_TEMPLATE,
+)).encode(), digest_size=8).hexdigest()
+
+# Sync OpenAI clients shared across generator instances, keyed on API key,
+# so every pipeline reuses one keep-alive connection pool
+_CLIENT_CACHE: Dict[str, "OpenAI"] = {}
+
+
+def _get_client(api_key: str) -> "OpenAI":
+    """Return the shared OpenAI client for api_key, creating it on first use"""
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        import httpx
+        from openai import OpenAI, DefaultHttpxClient
+        
+        # HTTP/2 needs the optional h2 package
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        
+        client = OpenAI(
+            api_key=api_key,
+            http_client=DefaultHttpxClient(
+                http2=http2,
+                limits=httpx.Limits(max_keepalive_connections=20)
+            )
+        )
+        _CLIENT_CACHE[api_key] = client
+    return client
+
 
 class SummaryGenerator:
     """
@@ -38,11 +221,17 @@ class SummaryGenerator:
         self.api_key = api_key
         self.client = None
         self.verbose = verbose
+        # Stable end-user tag so OpenAI routes requests to the same prompt cache
+        self._cache_user = (
+            'rolecolorai-' + hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
+            if api_key else 'rolecolorai'
+        )
+        # LLM results keyed on resume content, so replays skip the API call
+        self._summary_cache: OrderedDict = OrderedDict()
         
         if api_key:
             try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=api_key)
+                self.client = _get_client(api_key)
                 if self.verbose:
                     print("✓ OpenAI client initialized")
             except ImportError:
@@ -72,18 +261,23 @@ class SummaryGenerator:
         Returns:
             Dictionary with summary, method, tokens, cost
         """
-        dominant_role = max(role_scores.items(), key=lambda x: x[1])[0]
-        confidence = role_scores[dominant_role]
+        dominant_role, confidence = max(role_scores.items(), key=itemgetter(1))
         
         # Extract metadata
         metadata = self._extract_metadata(resume_text)
         
         # Try LLM generation if client available
         if self.client and confidence > LLM_MIN_CONFIDENCE:
+            cache_key = self._summary_cache_key(resume_text, dominant_role, original_summary)
+            cached = self._get_cached_summary(cache_key)
+            if cached is not None:
+                return cached
             try:
-                return self._llm_generation(
+                result = self._llm_generation(
                     resume_text, dominant_role, role_scores, metadata, original_summary
                 )
+                self._cache_summary(cache_key, result)
+                return result
             except Exception as e:
                 if self.verbose:
                     print(f"⚠ LLM generation failed: {e}. Falling back to template.")
@@ -91,62 +285,331 @@ class SummaryGenerator:
         # Template fallback
         return self._template_generation(dominant_role, metadata, confidence)
     
-    def _extract_metadata(self, resume_text: str) -> Dict:
-        """Extract years, title, skills from resume"""
-        metadata = {
-            'years': 'experienced',
-            'title': 'professional',
-            'skills': []
-        }
+    async def generate_summary_async(
+        self,
+        resume_text: str,
+        role_scores: Dict[str, float],
+        original_summary: str = "",
+        aclient: "AsyncOpenAI" = None
+    ) -> Dict:
+        """
+        Async variant of generate_summary using an AsyncOpenAI client.
         
-        # Extract years
-        years_match = re.search(r'(\d+)[\+]?\s*years?', resume_text, re.IGNORECASE)
-        if years_match:
-            metadata['years'] = years_match.group(1)
-        
-        # Extract title (heuristic: first capitalized multi-word phrase)
-        lines = resume_text.split('\n')
-        for line in lines[:5]:
-            line = line.strip()
-            if re.match(r'^[A-Z][a-z]+(\s+[A-Z][a-z]+){1,3}$', line):
-                metadata['title'] = line
-                break
-        
-        # Extract common skills and capitalize properly
-        common_skills = {
-            'python', 'java', 'javascript', 'react', 'node', 'aws', 'docker',
-            'kubernetes', 'sql', 'machine learning', 'data science', 'api',
-            'go', 'postgresql', 'redis', 'kafka', 'graphql', 'microservices'
-        }
-        text_lower = resume_text.lower()
-        found_skills = []
-        for skill in common_skills:
-            if skill in text_lower:
-                # Capitalize properly: "python" -> "Python", "machine learning" -> "Machine Learning"
-                formatted_skill = ' '.join(word.capitalize() for word in skill.split())
-                found_skills.append(formatted_skill)
-        metadata['skills'] = found_skills[:5]
+        Args:
+            resume_text: Full resume text
+            role_scores: Dictionary of role scores
+            original_summary: Original summary from resume (if any)
+            aclient: Async client opened on the running event loop; one is
+                opened for this call if not given
+            
+        Returns:
+            Dictionary with summary, method, tokens, cost
+        """
+        dominant_role, confidence = max(role_scores.items(), key=itemgetter(1))
+        
+        metadata = self._extract_metadata(resume_text)
+        
+        if self.client and confidence > LLM_MIN_CONFIDENCE:
+            cache_key = self._summary_cache_key(resume_text, dominant_role, original_summary)
+            cached = self._get_cached_summary(cache_key)
+            if cached is not None:
+                return cached
+            if aclient is None:
+                # The client's connection pool is bound to the event loop that
+                # uses it, so a standalone call opens (and closes) its own
+                async with self._async_client() as aclient:
+                    return await self.generate_summary_async(
+                        resume_text, role_scores, original_summary, aclient
+                    )
+            try:
+                result = await self._llm_generation_async(
+                    aclient, resume_text, dominant_role, role_scores, metadata, original_summary
+                )
+                self._cache_summary(cache_key, result)
+                return result
+            except Exception as e:
+                if self.verbose:
+                    print(f"⚠ LLM generation failed: {e}. Falling back to template.")
         
-        return metadata
+        return self._template_generation(dominant_role, metadata, confidence)
     
-    def _llm_generation(
+    async def generate_summary_batch(
+        self,
+        items: List[Tuple[str, Dict[str, float], str]],
+        concurrency: int = None
+    ) -> List[Dict]:
+        """
+        Generate summaries for many resumes concurrently.
+        
+        LLM calls are I/O-bound, so up to `concurrency` requests are kept
+        in flight at once instead of waiting on each one in turn.
+        
+        Args:
+            items: List of (resume_text, role_scores, original_summary) tuples
+            concurrency: Maximum number of concurrent LLM requests
+            
+        Returns:
+            List of generation results, in the same order as items
+        """
+        if not self.client:
+            return self.generate_template_summaries(
+                [resume_text for resume_text, _, _ in items],
+                [role_scores for _, role_scores, _ in items]
+            )
+        
+        sem = asyncio.Semaphore(concurrency or LLM_MAX_CONCURRENCY)
+        
+        # One client for the whole batch, opened on (and closed with) this event loop
+        async with self._async_client() as aclient:
+            async def _sem_wrapped(index, resume_text, role_scores, original_summary):
+                async with sem:
+                    return index, await self.generate_summary_async(
+                        resume_text, role_scores, original_summary, aclient
+                    )
+            
+            tasks = [asyncio.create_task(_sem_wrapped(i, *item)) for i, item in enumerate(items)]
+            
+            # Collect results as they finish, so slow retries don't hold up the rest
+            results = [None] * len(items)
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                results[index] = result
+        return results
+    
+    def generate_summary_batch_sync(
+        self,
+        items: List[Tuple[str, Dict[str, float], str]],
+        concurrency: int = None,
+        use_batch_api: bool = False
+    ) -> List[Dict]:
+        """
+        Blocking wrapper around generate_summary_batch for non-async callers.
+        
+        Args:
+            items: List of (resume_text, role_scores, original_summary) tuples
+            concurrency: Maximum number of concurrent LLM requests
+            use_batch_api: Submit LLM requests through the OpenAI Batch API
+                (half the token cost, but results can take up to 24h)
+            
+        Returns:
+            List of generation results, in the same order as items
+        """
+        if use_batch_api and self.client:
+            return self._generate_summary_batch_offline(items)
+        if not self.client:
+            # Template-only mode: nothing to await, so skip the event loop
+            return self.generate_template_summaries(
+                [resume_text for resume_text, _, _ in items],
+                [role_scores for _, role_scores, _ in items]
+            )
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.generate_summary_batch(items, concurrency))
+        
+        # Called from a running event loop (Jupyter, async callers): asyncio.run
+        # can't nest, so run the batch on its own loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.generate_summary_batch(items, concurrency)).result()
+    
+    def generate_template_summaries(
+        self,
+        resume_texts: List[str],
+        role_scores_list: List[Dict[str, float]]
+    ) -> List[Dict]:
+        """
+        Template summaries for many resumes at once.
+        
+        Dominant roles are picked with one argmax over the (B, R) score
+        matrix rather than a max() per resume; ties go to the first role,
+        as in generate_summary.
+        
+        Args:
+            resume_texts: Full resume texts
+            role_scores_list: Role scores for each resume (all with the same roles)
+            
+        Returns:
+            List of template generation results, in input order
+        """
+        if not resume_texts:
+            return []
+        
+        roles = tuple(role_scores_list[0])
+        scores_mat = np.array([[role_scores[role] for role in roles] for role_scores in role_scores_list])
+        dom_idx = scores_mat.argmax(axis=1)
+        confidences = scores_mat[np.arange(len(dom_idx)), dom_idx]
+        
+        return [
+            self._template_generation(roles[i], self._extract_metadata(resume_text), confidence)
+            for resume_text, i, confidence in zip(resume_texts, dom_idx.tolist(), confidences.tolist())
+        ]
+    
+    def submit_batch(self, items: List[Tuple[str, Dict[str, float], str]]) -> str:
+        """
+        Submit summary requests to the OpenAI Batch API.
+        
+        Args:
+            items: List of (resume_text, role_scores, original_summary) tuples
+            
+        Returns:
+            Batch ID to pass to poll_batch
+        """
+        # Private, uniquely named input file, removed once uploaded
+        batch_file = tempfile.NamedTemporaryFile('w', suffix='.jsonl', encoding='utf-8', delete=False)
+        try:
+            with batch_file:
+                for i, (resume_text, role_scores, original_summary) in enumerate(items):
+                    dominant_role = max(role_scores, key=role_scores.__getitem__)
+                    metadata = self._extract_metadata(resume_text)
+                    messages = self._build_messages(resume_text, dominant_role, metadata, original_summary)
+                    batch_file.write(json.dumps({
+                        'custom_id': str(i),
+                        'method': 'POST',
+                        'url': '/v1/chat/completions',
+                        'body': self._request_body(messages)
+                    }, ensure_ascii=False) + '\n')
+            
+            with open(batch_file.name, 'rb') as f:
+                input_file = self.client.files.create(file=f, purpose='batch')
+        finally:
+            os.unlink(batch_file.name)
+        
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window=LLM_BATCH_COMPLETION_WINDOW
+        )
+        if self.verbose:
+            print(f"✓ Submitted {len(items)} summary requests as batch {batch.id}")
+        return batch.id
+    
+    def poll_batch(self, batch_id: str, poll_interval: float = None) -> List[Optional[Dict]]:
+        """
+        Wait for a Batch API job to finish and parse its results.
+        
+        Args:
+            batch_id: ID returned by submit_batch
+            poll_interval: Seconds to wait between status checks
+            
+        Returns:
+            List of generation results in submission order; entries are None
+            for requests that failed inside the batch
+            
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled
+        """
+        if poll_interval is None:
+            poll_interval = LLM_BATCH_POLL_INTERVAL
+        
+        batch = self.client.batches.retrieve(batch_id)
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch_id)
+        
+        if batch.status != 'completed':
+            raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+        
+        results = [None] * batch.request_counts.total
+        if not batch.output_file_id:
+            return results
+        
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            # One malformed row (e.g. null content) only costs that entry, not the batch
+            try:
+                entry = json.loads(line)
+                response = entry.get('response') or {}
+                if entry.get('error') or response.get('status_code') != 200:
+                    continue
+                body = response['body']
+                usage = body['usage']
+                results[int(entry['custom_id'])] = self._parse_response(
+                    body['choices'][0]['message']['content'],
+                    usage['prompt_tokens'],
+                    usage['completion_tokens'],
+                    method='llm_batch',
+                    cached_tokens=(usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+                )
+            except Exception as e:
+                if self.verbose:
+                    print(f"⚠ Skipping unreadable batch result: {e}")
+        
+        return results
+    
+    def _generate_summary_batch_offline(self, items: List[Tuple[str, Dict[str, float], str]]) -> List[Dict]:
+        """Generate summaries through the Batch API, using templates where it can't help"""
+        results = [None] * len(items)
+        
+        # Low-confidence resumes go straight to templates, same as generate_summary
+        pending = [
+            i for i, (_, role_scores, _) in enumerate(items)
+            if max(role_scores.values()) > LLM_MIN_CONFIDENCE
+        ]
+        
+        if pending:
+            try:
+                batch_id = self.submit_batch([items[i] for i in pending])
+                for i, result in zip(pending, self.poll_batch(batch_id)):
+                    results[i] = result
+            except Exception as e:
+                if self.verbose:
+                    print(f"⚠ Batch generation failed: {e}. Falling back to template.")
+        
+        fallback = [i for i, result in enumerate(results) if result is None]
+        templated = self.generate_template_summaries(
+            [items[i][0] for i in fallback],
+            [items[i][1] for i in fallback]
+        )
+        for i, result in zip(fallback, templated):
+            results[i] = result
+        
+        return results
+    
+    def _extract_metadata(self, resume_text: str) -> Dict:
+        """Extract years, title, skills from resume"""
+        metadata = _extract_metadata_cached(resume_text)
+        # Copy so callers can't mutate the cached entry
+        return {**metadata, 'skills': list(metadata['skills'])}
+    
+    def _summary_cache_key(self, resume_text: str, dominant_role: str, original_summary: str) -> Tuple:
+        """Cache key for LLM summaries of a resume"""
+        text_hash = hashlib.blake2b(resume_text.encode(), digest_size=16).digest()
+        return (text_hash, dominant_role, original_summary)
+    
+    def _get_cached_summary(self, key: Tuple) -> Optional[Dict]:
+        """Return a copy of a cached LLM summary, if present"""
+        result = self._summary_cache.get(key)
+        if result is None:
+            return None
+        self._summary_cache.move_to_end(key)
+        return dict(result)
+    
+    def _cache_summary(self, key: Tuple, result: Dict):
+        """Store an LLM summary, evicting the least recently used entry when full"""
+        self._summary_cache[key] = dict(result)
+        if len(self._summary_cache) > LLM_SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
+    
+    def _build_messages(
         self,
         resume_text: str,
         dominant_role: str,
-        role_scores: Dict[str, float],
         metadata: Dict,
         original_summary: str
-    ) -> Dict:
-        """Generate summary using OpenAI API"""
+    ) -> List[Dict]:
+        """Build the chat messages for the LLM: static system prompt + per-resume content"""
         
         # Extract key sections (token optimization)
         resume_extract = self._optimize_resume_extract(resume_text, max_words=RESUME_EXTRACT_MAX_WORDS)
         
-        # Build prompt - requesting narrative style, not bullet points
         skills_text = ', '.join(metadata['skills'][:5]) if metadata['skills'] else "technical skills"
-        role_definition = ROLE_DEFINITIONS.get(dominant_role, f"{dominant_role} role characteristics").strip()
         
-        prompt = f"""You are an expert career coach and resume writer. Rewrite the following resume summary for a candidate identified as a "{dominant_role}".
+        # Only the dominant role's definition is sent; the others would be unused tokens
+        role_definition = ROLE_DEFINITIONS.get(dominant_role, f"{dominant_role} role characteristics")
+        
+        user_content = f"""Rewrite the resume summary for a candidate identified as a "{dominant_role}".
 
 ROLE DEFINITION:
 {dominant_role}: {role_definition}
@@ -160,70 +623,136 @@ KEY EXPERIENCE:
 CANDIDATE METADATA:
 - Years of experience: {metadata['years']} years
 - Professional title: {metadata['title']}
-- Key skills: {skills_text}
-
-Return a JSON object with this exact structure:
-{{
-  "summary": "A cohesive, flowing paragraph (4-6 sentences) that reads naturally, not like a list",
-  "tone": "professional|strategic|dynamic|reliable"
-}}
-
-CRITICAL REQUIREMENTS:
-1. Write in **FIRST PERSON** (use "I" or action verbs without pronouns) - this is a resume, the candidate wrote it themselves
-2. Write a **cohesive, flowing paragraph** - NOT a list of bullet points or separate sentences
-3. Use natural transitions between sentences (e.g., "Leveraging...", "Through...", "Additionally...")
-4. Integrate skills naturally into sentences rather than listing them separately (e.g., "Building scalable APIs with Python and AWS" NOT "Skills: Python, AWS")
-5. Use {dominant_role}-specific language from the role definition above
-6. Include 1-2 quantified achievements if available in the experience
-7. Professional, confident tone - avoid jargon and phrases like "This professional is recognized for..." (sounds like someone else wrote it)
-8. Based ONLY on provided information (no hallucination)
-9. The summary should read like the candidate wrote it themselves, not like a third-party description
-10. Return valid JSON only"""
-
+- Key skills: {skills_text}"""
+        
+        return [
+            {"role": "system", "content": _STATIC_SYSTEM_PROMPT},
+            {"role": "user", "content": user_content}
+        ]
+    
+    def _request_body(self, messages: List[Dict]) -> Dict:
+        """Chat completion request parameters shared by all LLM paths"""
+        return {
+            'model': DEFAULT_LLM_MODEL,
+            'max_tokens': LLM_MAX_TOKENS,
+            'temperature': LLM_TEMPERATURE,
+            'messages': messages,
+            'response_format': {"type": "json_object"},
+            'user': self._cache_user
+        }
+    
+    def _llm_generation(
+        self,
+        resume_text: str,
+        dominant_role: str,
+        role_scores: Dict[str, float],
+        metadata: Dict,
+        original_summary: str
+    ) -> Dict:
+        """Generate summary using OpenAI API"""
+        
+        messages = self._build_messages(resume_text, dominant_role, metadata, original_summary)
+        
         try:
-            response = self.client.chat.completions.create(
-                model=DEFAULT_LLM_MODEL,
-                max_tokens=LLM_MAX_TOKENS,
-                temperature=LLM_TEMPERATURE,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
-            )
-            
-            # Parse response
-            result_text = response.choices[0].message.content
-            
-            # Try to extract JSON
-            try:
-                result = json.loads(result_text)
-                summary = result.get('summary', result_text)
-            except json.JSONDecodeError:
-                # Use raw text if not valid JSON
-                summary = result_text.strip()
+            response = self.client.chat.completions.create(**self._request_body(messages))
             
-            # Validate length (4-6 sentences)
-            sentences = [s.strip() for s in summary.split('.') if s.strip()]
-            if len(sentences) < 4 or len(sentences) > 6:
-                if self.verbose:
-                    print(f"⚠ LLM output has {len(sentences)} sentences, expected 4-6. Using anyway.")
+            return self._parse_response(
+                response.choices[0].message.content,
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens,
+                cached_tokens=_cached_tokens(response.usage)
+            )
             
-            # Calculate cost (GPT-4o-mini pricing: $0.15/$0.60 per 1M tokens)
-            input_tokens = response.usage.prompt_tokens
-            output_tokens = response.usage.completion_tokens
-            cost = (input_tokens / 1_000_000 * 0.15 + output_tokens / 1_000_000 * 0.60)
+        except Exception as e:
+            if self.verbose:
+                print(f"⚠ LLM API call failed: {e}")
+            raise
+    
+    async def _llm_generation_async(
+        self,
+        aclient: "AsyncOpenAI",
+        resume_text: str,
+        dominant_role: str,
+        role_scores: Dict[str, float],
+        metadata: Dict,
+        original_summary: str
+    ) -> Dict:
+        """Generate summary using the async OpenAI client"""
+        
+        messages = self._build_messages(resume_text, dominant_role, metadata, original_summary)
+        
+        try:
+            response = await self._create_with_retry(aclient, messages)
             
-            return {
-                'summary': summary,
-                'method': 'llm',
-                'model': DEFAULT_LLM_MODEL,
-                'tokens': input_tokens + output_tokens,
-                'cost': cost
-            }
+            return self._parse_response(
+                response.choices[0].message.content,
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens,
+                cached_tokens=_cached_tokens(response.usage)
+            )
             
         except Exception as e:
             if self.verbose:
                 print(f"⚠ LLM API call failed: {e}")
             raise
     
+    async def _create_with_retry(self, aclient: "AsyncOpenAI", messages: List[Dict]):
+        """Async chat completion, retried with exponential backoff on rate limits"""
+        try:
+            from openai import RateLimitError
+            from tenacity import (
+                AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+            )
+        except ImportError:
+            return await aclient.chat.completions.create(**self._request_body(messages))
+        
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(LLM_RETRY_ATTEMPTS),
+            wait=wait_exponential(multiplier=1, min=1, max=8),
+            retry=retry_if_exception_type(RateLimitError),
+            reraise=True
+        ):
+            with attempt:
+                return await aclient.chat.completions.create(**self._request_body(messages))
+    
+    def _async_client(self) -> "AsyncOpenAI":
+        """New AsyncOpenAI client for the running event loop (use with async with)"""
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=self.api_key)
+    
+    def _parse_response(
+        self,
+        result_text: str,
+        input_tokens: int,
+        output_tokens: int,
+        method: str = 'llm',
+        cached_tokens: int = 0
+    ) -> Dict:
+        """Parse LLM output into the generation result dictionary"""
+        summary = _decode_summary(result_text)
+        
+        # Validate length (4-6 sentences): count periods, plus any unterminated tail
+        n_sentences = summary.count('.')
+        if summary.strip() and not summary.rstrip().endswith('.'):
+            n_sentences += 1
+        if n_sentences < 4 or n_sentences > 6:
+            if self.verbose:
+                print(f"⚠ LLM output has {n_sentences} sentences, expected 4-6. Using anyway.")
+        
+        # Calculate cost; prompt-cache hits on the input are billed at a discount
+        billed_input = input_tokens - cached_tokens * LLM_CACHED_INPUT_DISCOUNT
+        cost = billed_input * _COST_IN + output_tokens * _COST_OUT
+        if method == 'llm_batch':
+            cost *= LLM_BATCH_COST_DISCOUNT
+        
+        return {
+            'summary': summary,
+            'method': method,
+            'model': DEFAULT_LLM_MODEL,
+            'tokens': input_tokens + output_tokens,
+            'cost': cost
+        }
+    
     def _template_generation(
         self, 
         dominant_role: str, 
@@ -241,60 +770,9 @@ CRITICAL REQUIREMENTS:
             years_prefix = "with extensive experience"
         else:
             years_prefix = f"with {years_text} years of experience"
-        title_text = metadata['title']
-        
-        # Predefined templates - written in first person, natural resume style
-        if dominant_role == 'Builder':
-            summary = (
-                f"Experienced {title_text} {years_prefix} in architecting scalable systems "
-                f"and driving technical vision. "
-                f"Leverage a strong background in {skills_text} to transform abstract concepts into foundational "
-                f"infrastructure that supports organizational growth. "
-                f"Have a proven track record of designing long-term solutions and building frameworks that scale "
-                f"with evolving business needs, consistently delivering innovative approaches to complex technical challenges."
-            )
-        elif dominant_role == 'Enabler':
-            # Handle case where title might be generic
-            title_display = title_text if title_text and title_text != 'professional' else "Professional"
-            summary = (
-                f"{title_display} {years_prefix} in cross-functional collaboration and "
-                f"bridging gaps between technical and business stakeholders. "
-                f"Use expertise in {skills_text} to coordinate complex initiatives across multiple teams and "
-                f"unblock critical paths, delivering measurable results. "
-                f"Facilitate seamless collaboration and enable high-performing teams through effective communication "
-                f"and strategic execution."
-            )
-        elif dominant_role == 'Thriver':
-            summary = (
-                f"{title_text} {years_prefix} thriving in fast-paced, dynamic environments "
-                f"where rapid adaptation is essential. "
-                f"Leverage technical expertise in {skills_text} to rapidly iterate and ship high-quality solutions "
-                f"under tight deadlines while maintaining delivery standards. "
-                f"Deliver exceptional results even under pressure and uncertainty, consistently demonstrating "
-                f"the ability to pivot quickly and adapt to changing requirements."
-            )
-        elif dominant_role == 'Supportee':
-            summary = (
-                f"{title_text} {years_prefix} focused on reliability and operational excellence "
-                f"through rigorous processes and attention to detail. "
-                f"Apply deep expertise in {skills_text} to maintain critical systems and ensure consistent quality "
-                f"through comprehensive documentation and standardized procedures. "
-                f"Committed to operational excellence with a proven track record of implementing standards that "
-                f"reduce risk and improve system stability."
-            )
-        else:
-            # Dynamic template generation for new roles - first person resume style
-            role_definition = ROLE_DEFINITIONS.get(dominant_role, "")
-            summary = (
-                f"Experienced {title_text} {years_prefix}, demonstrating strong alignment "
-                f"with {dominant_role} principles through professional work. "
-                f"Leverage skills in {skills_text} to apply {dominant_role.lower()} approaches and deliver "
-                f"consistent value. "
-                f"Committed to excellence with a track record of meaningful contributions."
-            )
         
         return {
-            'summary': summary,
+            'summary': _render_template(dominant_role, metadata['title'], years_prefix, skills_text),
             'method': 'template',
             'model': 'rule-based',
             'tokens': 0,
@@ -305,14 +783,113 @@ CRITICAL REQUIREMENTS:
         """Extract most relevant content from resume for LLM"""
         if max_words is None:
             max_words = RESUME_EXTRACT_MAX_WORDS
-            
-        # Simple extraction: first N words
-        words = resume_text.split()
-        extract = ' '.join(words[:max_words])
-        
-        # Try to end on sentence boundary
-        last_period = extract.rfind('.')
-        if last_period > len(extract) * 0.8:  # If close to end
-            extract = extract[:last_period + 1]
-        
-        return extract
+        return _resume_extract_cached(resume_text, max_words)
+
+
+@lru_cache(maxsize=1024)
+def _render_template(role: str, title: str, years_prefix: str, skills_text: str) -> str:
+    """Fill the role's summary template (memoized; templates are deterministic)"""
+    # Enabler leads with the title, so avoid a lowercase generic one
+    title_display = title if title and title != 'professional' else "Professional"
+    
+    return _TEMPLATES.get(role, _FALLBACK_TEMPLATE).format(
+        title=title,
+        title_display=title_display,
+        years_prefix=years_prefix,
+        skills=skills_text,
+        role=role,
+        role_lower=role.lower()
+    )
+
+
+def _decode_summary(result_text: str) -> str:
+    """Extract the summary from the LLM's JSON reply, or use the raw text"""
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(result_text, type=LLMResponse).summary
+        except msgspec.DecodeError:
+            # Use raw text if not valid JSON or missing the summary field
+            return result_text.strip()
+    
+    # Try to extract JSON
+    try:
+        result = json.loads(result_text)
+        return result.get('summary', result_text)
+    except json.JSONDecodeError:
+        # Use raw text if not valid JSON
+        return result_text.strip()
+
+
+def _cached_tokens(usage) -> int:
+    """Prompt tokens served from OpenAI's prompt cache, 0 if not reported"""
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return getattr(details, 'cached_tokens', None) or 0
+
+
+@lru_cache(maxsize=256)
+def _extract_metadata_cached(resume_text: str) -> Dict:
+    """Extract years, title, skills from resume (memoized on resume text)"""
+    metadata = {
+        'years': 'experienced',
+        'title': 'professional',
+        'skills': []
+    }
+    
+    # Extract years
+    years_match = _YEARS_RE.search(resume_text)
+    if years_match:
+        metadata['years'] = years_match.group(1)
+    
+    # Extract title (heuristic: first capitalized multi-word phrase)
+    lines = resume_text.split('\n', 5)
+    for line in lines[:5]:
+        line = line.strip()
+        if _TITLE_RE.match(line):
+            metadata['title'] = line
+            break
+    
+    # Extract common skills in a single pass, with proper capitalization
+    metadata['skills'] = _find_skills(resume_text)[:5]
+    
+    return metadata
+
+
+def _find_skills(resume_text: str) -> List[str]:
+    """Display names of COMMON_SKILLS appearing as whole words in the text, in order of appearance"""
+    if _SKILL_AC is None:
+        return list(dict.fromkeys(_SKILL_CANON[m.lower()] for m in _SKILLS_RE.findall(resume_text)))
+    
+    text_lower = resume_text.lower()
+    last = len(text_lower) - 1
+    found = {}
+    for end, (length, canon) in _SKILL_AC.iter(text_lower):
+        start = end - length + 1
+        # Whole words only, same as the word-boundary anchors in _SKILLS_RE
+        if start > 0 and _is_word_char(text_lower[start - 1]):
+            continue
+        if end < last and _is_word_char(text_lower[end + 1]):
+            continue
+        # Dict keys dedupe while keeping first-seen order
+        found[canon] = None
+    return list(found)
+
+
+def _is_word_char(char: str) -> bool:
+    """Whether char is a word character, as used by regex word boundaries"""
+    return char.isalnum() or char == '_'
+
+
+@lru_cache(maxsize=256)
+def _resume_extract_cached(resume_text: str, max_words: int) -> str:
+    """First max_words words of the resume, trimmed to a sentence boundary (memoized)"""
+    # Simple extraction: first N words, whitespace collapsed. maxsplit stops
+    # splitting after max_words (the unsplit remainder is dropped), so long
+    # resumes never materialize their full word list.
+    extract = ' '.join(resume_text.split(None, max_words)[:max_words])
+    
+    # Try to end on sentence boundary (only the last 20% is searched)
+    last_period = extract.rfind('.', int(len(extract) * 0.8))
+    if last_period > len(extract) * 0.8:  # If close to end
+        extract = extract[:last_period + 1]
+    
+    return extract
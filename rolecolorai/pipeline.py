@@ -4,27 +4,61 @@ Pipeline Module
 Main orchestration class for end-to-end resume analysis.
 """
 
-from typing import Dict, Optional
+import hashlib
+import re
+import sys
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
+from .config import CACHE_DIR, ORIGINAL_SUMMARY_CACHE_SIZE
 from .scorer import SemanticRoleScorer
 from .generator import SummaryGenerator
 
+# Section headers that start and end the summary section
+_SUMMARY_HEADERS = frozenset(['summary', 'objective', 'profile', 'about'])
+_END_HEADERS = frozenset([
+    'experience', 'professional experience', 'work experience',
+    'education', 'skills', 'technical skills', 'work history',
+    'employment', 'projects', 'certifications', 'awards'
+])
+
+
+def _header_pattern(headers) -> str:
+    """Regex alternation over header literals, longest first"""
+    return '|'.join(re.escape(h) for h in sorted(headers, key=len, reverse=True))
+
+
+# One pattern for both kinds of header line. A summary header is the whole line
+# or precedes a colon (and consumes the line); an end header is the whole line
+# or precedes a colon or space.
+_SECTION_HEADER_RE = re.compile(
+    rf'^[^\S\n]*(?:'
+    rf'(?P<summary>(?:{_header_pattern(_SUMMARY_HEADERS)})(?=[^\S\n]*$|:)[^\n]*)'
+    rf'|(?P<end>(?:{_header_pattern(_END_HEADERS)})(?=[^\S\n]*$|[: ]))'
+    rf')',
+    re.IGNORECASE | re.MULTILINE
+)
+
 
 class RoleColorPipeline:
     """Complete end-to-end pipeline"""
     
-    def __init__(self, api_key: Optional[str] = None, verbose: bool = True):
+    def __init__(self, api_key: Optional[str] = None, verbose: bool = True, cache_dir: Optional[str] = CACHE_DIR):
         """
         Initialize pipeline components.
         
         Args:
             api_key: OpenAI API key (optional)
             verbose: Whether to print initialization messages
+            cache_dir: Directory for the scorer's embedding cache, or None to
+                disable it
         """
         self.verbose = verbose
+        self._original_summary_cache: OrderedDict = OrderedDict()
         if self.verbose:
             print("Initializing RoleColorAI Pipeline...")
-        self.scorer = SemanticRoleScorer(verbose=verbose)
+        self.scorer = SemanticRoleScorer(verbose=verbose, cache_dir=cache_dir)
         self.generator = SummaryGenerator(api_key, verbose=verbose)
         if self.verbose:
             print("✓ Pipeline ready\n")
@@ -47,6 +81,10 @@ class RoleColorPipeline:
         # Step 1: Score resume
         if self.verbose:
             print("\n[1/2] Scoring resume using semantic embeddings...")
+        
+        if self.generator.client is not None:
+            return self._analyze_resume_overlapped(resume_text)
+        
         scoring_result = self.scorer.score_resume(resume_text)
         
         if 'error' in scoring_result:
@@ -55,13 +93,7 @@ class RoleColorPipeline:
                 'scores': scoring_result['scores']
             }
         
-        if self.verbose:
-            print(f"✓ Scored {scoring_result['sentences_used']} sentences")
-            print(f"✓ Dominant role: {scoring_result['dominant_role']} ({scoring_result['confidence']:.1%} confidence)")
-        
-        # Step 2: Generate summary
-        if self.verbose:
-            print("\n[2/2] Generating RoleColor-aligned summary...")
+        self._report_scoring(scoring_result)
         
         # Extract original summary if exists
         original_summary = self._extract_original_summary(resume_text)
@@ -72,12 +104,117 @@ class RoleColorPipeline:
             original_summary
         )
         
+        self._report_generation(generation_result)
+        
+        return self._compile_result(scoring_result, generation_result, original_summary)
+    
+    def _analyze_resume_overlapped(self, resume_text: str) -> Dict:
+        """
+        analyze_resume for the LLM path, overlapping the summary request with scoring.
+        
+        The LLM call only needs the aggregated role scores, so it is started in
+        a worker thread as soon as they are known and runs while the
+        per-sentence breakdown is built.
+        
+        Args:
+            resume_text: Raw resume text to analyze
+            
+        Returns:
+            Dictionary with complete analysis results
+        """
+        # Extract original summary if exists
+        original_summary = self._extract_original_summary(resume_text)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            generation = []
+            
+            def start_generation(core: Dict):
+                self._report_scoring(core)
+                generation.append(executor.submit(
+                    self.generator.generate_summary,
+                    resume_text,
+                    core['scores'],
+                    original_summary
+                ))
+            
+            scoring_result = self.scorer.score_resume(resume_text, on_core=start_generation)
+            if 'error' in scoring_result:
+                return {
+                    'error': scoring_result['error'],
+                    'scores': scoring_result['scores']
+                }
+            generation_result = generation[0].result()
+        
+        self._report_generation(generation_result)
+        
+        return self._compile_result(scoring_result, generation_result, original_summary)
+    
+    def _report_scoring(self, scoring_result: Dict):
+        """Print scoring progress and announce the generation step (verbose mode)"""
+        if self.verbose:
+            print(f"✓ Scored {scoring_result['sentences_used']} sentences")
+            print(f"✓ Dominant role: {scoring_result['dominant_role']} ({scoring_result['confidence']:.1%} confidence)")
+            
+            # Step 2: Generate summary
+            print("\n[2/2] Generating RoleColor-aligned summary...")
+    
+    def _report_generation(self, generation_result: Dict):
+        """Print summary generation outcome (verbose mode)"""
         if self.verbose:
             print(f"✓ Summary generated using {generation_result['method']}")
             if generation_result.get('tokens'):
                 print(f"  Tokens: {generation_result['tokens']}, Cost: ${generation_result['cost']:.4f}")
+    
+    def analyze_resumes(self, resume_texts: List[str], use_batch_api: bool = False) -> List[Dict]:
+        """
+        Analyze many resumes, generating their summaries concurrently.
+        
+        Args:
+            resume_texts: List of raw resume texts to analyze
+            use_batch_api: Generate summaries through the OpenAI Batch API
+                (cheaper, but may take minutes to hours)
+            
+        Returns:
+            List of analysis result dictionaries, in input order
+        """
+        if self.verbose:
+            print("=" * 60)
+            print(f"ANALYZING {len(resume_texts)} RESUMES")
+            print("=" * 60)
+            print(f"\n[1/2] Scoring {len(resume_texts)} resumes using semantic embeddings...")
+        
+        scoring_results = self.scorer.score_resumes(resume_texts)
+        original_summaries = [self._extract_original_summary(text) for text in resume_texts]
+        
+        # Only resumes that scored successfully need a summary
+        pending = [i for i, scoring in enumerate(scoring_results) if 'error' not in scoring]
+        
+        if self.verbose:
+            print(f"\n[2/2] Generating {len(pending)} RoleColor-aligned summaries...")
         
-        # Compile results
+        generation_results = self.generator.generate_summary_batch_sync([
+            (resume_texts[i], scoring_results[i]['scores'], original_summaries[i])
+            for i in pending
+        ], use_batch_api=use_batch_api)
+        generated = dict(zip(pending, generation_results))
+        
+        results = []
+        for i, scoring_result in enumerate(scoring_results):
+            if i not in generated:
+                results.append({
+                    'error': scoring_result['error'],
+                    'scores': scoring_result['scores']
+                })
+            else:
+                results.append(self._compile_result(scoring_result, generated[i], original_summaries[i]))
+        
+        if self.verbose:
+            print(f"✓ Analyzed {len(results)} resumes")
+        
+        return results
+    
+    def _compile_result(self, scoring_result: Dict, generation_result: Dict, original_summary: str) -> Dict:
+        """Combine scoring and generation output into the analysis result"""
         result = {
             'rolecolor_scores': scoring_result['scores'],
             'dominant_role': scoring_result['dominant_role'],
@@ -98,150 +235,167 @@ class RoleColorPipeline:
         return result
     
     def _extract_original_summary(self, resume_text: str) -> str:
-        """Extract original summary section if exists"""
-        lines = resume_text.split('\n')
-        summary_lines = []
-        in_summary = False
+        """Extract original summary section if exists (memoized per resume text)"""
+        cache_key = hashlib.blake2b(resume_text.encode(), digest_size=16).digest()
+        summary = self._original_summary_cache.get(cache_key)
+        if summary is not None:
+            self._original_summary_cache.move_to_end(cache_key)
+            return summary
         
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Detect summary section header (must be a header, not just contain the word)
-            if any(line_lower == h or line_lower.startswith(h + ':') for h in ['summary', 'objective', 'profile', 'about']):
-                in_summary = True
-                continue
-            
-            # Detect end of summary - look for section headers, not just words
-            if in_summary:
-                # Common section headers that indicate end of summary
-                section_headers = [
-                    'experience', 'professional experience', 'work experience',
-                    'education', 'skills', 'technical skills', 'work history',
-                    'employment', 'projects', 'certifications', 'awards'
-                ]
-                
-                # Check if this line is a section header
-                is_section_header = False
-                for header in section_headers:
-                    if (line_lower == header or 
-                        line_lower.startswith(header + ':') or
-                        line_lower.startswith(header + ' ')):
-                        is_section_header = True
-                        break
-                
-                if is_section_header:
-                    break
-            
-            if in_summary and line.strip():
-                summary_lines.append(line.strip())
+        summary = self._scan_original_summary(resume_text)
+        self._original_summary_cache[cache_key] = summary
+        if len(self._original_summary_cache) > ORIGINAL_SUMMARY_CACHE_SIZE:
+            self._original_summary_cache.popitem(last=False)
+        return summary
+    
+    def _scan_original_summary(self, resume_text: str) -> str:
+        """Uncached summary section scan behind _extract_original_summary"""
+        # Single scan over header lines: the section runs from the first summary
+        # header to the next section header; repeated summary headers are skipped
+        segments = []
+        pos = None
+        for match in _SECTION_HEADER_RE.finditer(resume_text):
+            if match.lastgroup == 'summary':
+                if pos is not None:
+                    segments.append(resume_text[pos:match.start()])
+                pos = match.end()
+            elif pos is not None:
+                segments.append(resume_text[pos:match.start()])
+                pos = None
+                break
+        if pos is not None:
+            segments.append(resume_text[pos:])
+        
+        # Only the summary section itself is split into lines, stripped once each
+        summary_lines = [
+            line
+            for segment in segments
+            for line in map(str.strip, segment.split('\n'))
+            if line
+        ]
         
         return ' '.join(summary_lines) if summary_lines else "No summary found in original resume."
     
-    def print_results(self, result: Dict, verbose: bool = False):
-        """Pretty print analysis results"""
-        print("\n" + "=" * 60)
-        print("ANALYSIS RESULTS")
-        print("=" * 60)
+    @staticmethod
+    def print_results(result: Dict, verbose: bool = False, show_table: Optional[bool] = None):
+        """
+        Pretty print analysis results.
+        
+        Args:
+            result: Analysis result from analyze_resume
+            verbose: Show the detailed per-sentence view
+            show_table: Show the compact per-sentence table (non-verbose mode);
+                defaults to whether stdout is a terminal
+        """
+        # Lines are collected and written to stdout in one call
+        out = ["\n" + "=" * 60, "ANALYSIS RESULTS", "=" * 60]
         
         if 'error' in result:
-            print(f"\n⚠ Error: {result['error']}")
+            out.append(f"\n⚠ Error: {result['error']}")
+            sys.stdout.write('\n'.join(out) + '\n')
             return
         
         # Scores
-        print("\n📊 ROLECOLOR SCORE DISTRIBUTION:")
-        print("-" * 60)
+        out.append("\n📊 ROLECOLOR SCORE DISTRIBUTION:")
+        out.append("-" * 60)
         for role, score in sorted(result['rolecolor_scores'].items(), key=lambda x: x[1], reverse=True):
             bar = '█' * int(score * 50)
-            print(f"  {role:12s}: {score:5.1%} {bar}")
+            out.append(f"  {role:12s}: {score:5.1%} {bar}")
         
-        print(f"\n🎯 DOMINANT ROLE: {result['dominant_role']} ({result['confidence']:.1%} confidence)")
+        out.append(f"\n🎯 DOMINANT ROLE: {result['dominant_role']} ({result['confidence']:.1%} confidence)")
         
         # Evidence
-        print("\n📝 TOP EVIDENCE SENTENCES:")
-        print("-" * 60)
+        out.append("\n📝 TOP EVIDENCE SENTENCES:")
+        out.append("-" * 60)
         for i, sent in enumerate(result['top_evidence'], 1):
-            print(f"  {i}. {sent[:100]}{'...' if len(sent) > 100 else ''}")
+            out.append(f"  {i}. {sent[:100]}{'...' if len(sent) > 100 else ''}")
         
         # Sentence scores - always show summary, detailed in verbose
         if 'sentence_scores' in result and result['sentence_scores']:
             if verbose:
                 # Detailed view
-                print("\n🔍 DETAILED SENTENCE SCORES:")
-                print("-" * 60)
+                out.append("\n🔍 DETAILED SENTENCE SCORES:")
+                out.append("-" * 60)
                 for sent_data in result['sentence_scores'][:15]:  # Show top 15 sentences
-                    print(f"\n  Sentence #{sent_data['sentence_index'] + 1}:")
-                    print(f"    Text: {sent_data['sentence'][:80]}{'...' if len(sent_data['sentence']) > 80 else ''}")
-                    print(f"    Best Match: {sent_data['best_match_role']} ({sent_data['best_match_score']:.3f})")
-                    print(f"    All Scores: ", end="")
+                    out.append(f"\n  Sentence #{sent_data['sentence_index'] + 1}:")
+                    out.append(f"    Text: {sent_data['sentence'][:80]}{'...' if len(sent_data['sentence']) > 80 else ''}")
+                    out.append(f"    Best Match: {sent_data['best_match_role']} ({sent_data['best_match_score']:.3f})")
                     score_str = ", ".join([f"{role}: {score:.3f}" for role, score in sorted(
                         sent_data['role_scores'].items(), key=lambda x: x[1], reverse=True
                     )])
-                    print(score_str)
+                    out.append(f"    All Scores: {score_str}")
                 
                 if len(result['sentence_scores']) > 15:
-                    print(f"\n    ... and {len(result['sentence_scores']) - 15} more sentences")
+                    out.append(f"\n    ... and {len(result['sentence_scores']) - 15} more sentences")
                 
                 # Embedding info
                 if 'embedding_dim' in result and result['embedding_dim'] > 0:
-                    print(f"\n  📐 Embedding Dimension: {result['embedding_dim']}")
+                    out.append(f"\n  📐 Embedding Dimension: {result['embedding_dim']}")
             else:
-                # Compact summary view (always shown)
-                print("\n📊 SENTENCE SCORES (All Sentences):")
-                print("-" * 60)
-                print(f"{'#':<4} {'Sentence (truncated)':<50} {'Builder':<8} {'Enabler':<8} {'Thriver':<8} {'Supportee':<8} {'Best':<10}")
-                print("-" * 60)
+                # Compact summary view (always shown); the per-sentence table is
+                # skipped by default when output is piped
+                if show_table is None:
+                    show_table = sys.stdout.isatty()
                 
-                for sent_data in result['sentence_scores']:
-                    idx = sent_data['sentence_index'] + 1
-                    sent_text = sent_data['sentence'][:47] + '...' if len(sent_data['sentence']) > 50 else sent_data['sentence']
-                    scores = sent_data['role_scores']
-                    best_role = sent_data['best_match_role']
-                    best_score = sent_data['best_match_score']
+                if show_table:
+                    out.append("\n📊 SENTENCE SCORES (All Sentences):")
+                    out.append("-" * 60)
+                    out.append(f"{'#':<4} {'Sentence (truncated)':<50} {'Builder':<8} {'Enabler':<8} {'Thriver':<8} {'Supportee':<8} {'Best':<10}")
+                    out.append("-" * 60)
                     
-                    print(f"{idx:<4} {sent_text:<50} "
-                          f"{scores.get('Builder', 0):<8.3f} "
-                          f"{scores.get('Enabler', 0):<8.3f} "
-                          f"{scores.get('Thriver', 0):<8.3f} "
-                          f"{scores.get('Supportee', 0):<8.3f} "
-                          f"{best_role} ({best_score:.3f})")
+                    # Same template for every row, so format it once
+                    row_format = '{:<4} {:<50} {:<8.3f} {:<8.3f} {:<8.3f} {:<8.3f} {} ({:.3f})'.format
+                    for sent_data in result['sentence_scores']:
+                        sentence = sent_data['sentence']
+                        sent_text = sentence[:47] + '...' if len(sentence) > 50 else sentence
+                        scores = sent_data['role_scores']
+                        out.append(row_format(
+                            sent_data['sentence_index'] + 1,
+                            sent_text,
+                            scores.get('Builder', 0),
+                            scores.get('Enabler', 0),
+                            scores.get('Thriver', 0),
+                            scores.get('Supportee', 0),
+                            sent_data['best_match_role'],
+                            sent_data['best_match_score']
+                        ))
+                else:
+                    out.append("\n📊 SENTENCE SCORES:")
                 
                 # Summary stats
-                role_counts = {}
-                for sent_data in result['sentence_scores']:
-                    role = sent_data['best_match_role']
-                    role_counts[role] = role_counts.get(role, 0) + 1
+                role_counts = Counter(sent_data['best_match_role'] for sent_data in result['sentence_scores'])
                 
-                print("-" * 60)
-                print(f"  Summary: ", end="")
+                out.append("-" * 60)
                 summary_parts = [f"{role}: {count} sentences" for role, count in sorted(role_counts.items(), key=lambda x: x[1], reverse=True)]
-                print(", ".join(summary_parts))
+                out.append("  Summary: " + ", ".join(summary_parts))
                 
                 if 'embedding_dim' in result and result['embedding_dim'] > 0:
-                    print(f"  📐 Embedding Dimension: {result['embedding_dim']}")
+                    out.append(f"  📐 Embedding Dimension: {result['embedding_dim']}")
                 
-                print(f"\n  💡 Use --verbose or -v flag for detailed view with full sentence text")
+                out.append(f"\n  💡 Use --verbose or -v flag for detailed view with full sentence text")
         
         # Summaries
-        print("\n📄 ORIGINAL SUMMARY:")
-        print("-" * 60)
-        print(f"  {result['original_summary'][:200]}{'...' if len(result['original_summary']) > 200 else ''}")
+        out.append("\n📄 ORIGINAL SUMMARY:")
+        out.append("-" * 60)
+        out.append(f"  {result['original_summary'][:200]}{'...' if len(result['original_summary']) > 200 else ''}")
         
-        print("\n✨ REWRITTEN SUMMARY:")
-        print("-" * 60)
+        out.append("\n✨ REWRITTEN SUMMARY:")
+        out.append("-" * 60)
         # Print as a flowing paragraph, not bullet points
         summary_text = result['rewritten_summary'].strip()
         # Ensure it ends with a period
         if not summary_text.endswith('.'):
             summary_text += '.'
-        print(f"  {summary_text}")
+        out.append(f"  {summary_text}")
         
         # Metadata
-        print("\n⚙️  METADATA:")
-        print("-" * 60)
-        print(f"  Generation method: {result['generation_method']}")
-        print(f"  Sentences analyzed: {result['metadata']['total_sentences']}")
+        out.append("\n⚙️  METADATA:")
+        out.append("-" * 60)
+        out.append(f"  Generation method: {result['generation_method']}")
+        out.append(f"  Sentences analyzed: {result['metadata']['total_sentences']}")
         if result['metadata']['generation_tokens'] > 0:
-            print(f"  Tokens used: {result['metadata']['generation_tokens']}")
-            print(f"  Cost: ${result['metadata']['generation_cost']:.4f}")
+            out.append(f"  Tokens used: {result['metadata']['generation_tokens']}")
+            out.append(f"  Cost: ${result['metadata']['generation_cost']:.4f}")
         
-        print("\n" + "=" * 60)
+        out.append("\n" + "=" * 60)
+        sys.stdout.write('\n'.join(out) + '\n')
@@ -5,13 +5,24 @@ Provides semantic embedding-based scoring for resume classification.
 Uses SentenceTransformers for context-aware role matching.
 """
 
+import copy
+import hashlib
+import math
 import numpy as np
 import re
-from typing import Dict, List, Tuple
+import shelve
+from collections import OrderedDict
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from .config import (
     ROLE_DEFINITIONS,
     DEFAULT_MODEL,
+    CACHE_DIR,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_BATCH_SIZE,
+    SCORE_CACHE_SIZE,
     ATTENTION_TOP_PERCENT,
     ATTENTION_MID_PERCENT,
     ATTENTION_TOP_WEIGHT,
@@ -20,6 +31,53 @@ from .config import (
     SOFTMAX_TEMPERATURE
 )
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# Sentence extraction patterns, compiled once
+_BULLET_RE = re.compile(r'^[-•*]\s*')
+_NON_ALPHA_RE = re.compile(r'[\W\d_]+')
+_BOILER_RE = re.compile(
+    r'references available|upon request|email:|phone:|education:|skills:|experience:',
+    re.IGNORECASE
+)
+# Byte lookup table for the sentence splitter: '.', '!', '?' and newline end a span
+_SPAN_BREAK = np.zeros(256, dtype=bool)
+_SPAN_BREAK[[ord(c) for c in '.!?\n']] = True
+
+
+# Loaded SentenceTransformer models shared across scorer instances, keyed on
+# model name, as (model, precision) - loading weights takes seconds
+_MODEL_CACHE: Dict[str, Tuple["SentenceTransformer", str]] = {}
+
+
+def _get_model(model_name: str) -> Tuple["SentenceTransformer", str]:
+    """Return the shared model for model_name and its precision, loading it on first use"""
+    cached = _MODEL_CACHE.get(model_name)
+    if cached is not None:
+        return cached
+    
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise ImportError(
+            "sentence-transformers not installed. Run: pip install sentence-transformers"
+        )
+    model = SentenceTransformer(model_name)
+    
+    # Half precision on GPU roughly doubles encode throughput
+    precision = 'fp32'
+    try:
+        import torch
+        if torch.cuda.is_available():
+            model = model.half().to('cuda')
+            precision = 'fp16'
+    except ImportError:
+        pass
+    
+    _MODEL_CACHE[model_name] = (model, precision)
+    return model, precision
+
 
 class SemanticRoleScorer:
     """
@@ -29,26 +87,28 @@ class SemanticRoleScorer:
     Handles paraphrasing, synonyms, and context automatically.
     """
     
-    def __init__(self, model_name: str = None, verbose: bool = True):
+    def __init__(self, model_name: str = None, verbose: bool = True, cache_dir: Optional[str] = CACHE_DIR):
         """
         Initialize with pre-trained semantic model.
         
         Args:
             model_name: Name of SentenceTransformer model to use
             verbose: Whether to print initialization messages
+            cache_dir: Directory for the on-disk embedding cache, or None to
+                disable it
         """
         self.model_name = model_name or DEFAULT_MODEL
         self.verbose = verbose
+        self._cache_path = Path(cache_dir).expanduser() / 'emb_cache' if cache_dir is not None else None
+        self._score_cache: OrderedDict = OrderedDict()
         
-        try:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer(self.model_name)
-            if self.verbose:
-                print(f"✓ Loaded semantic model: {self.model_name}")
-        except ImportError:
-            raise ImportError(
-                "sentence-transformers not installed. Run: pip install sentence-transformers"
-            )
+        self.model, precision = _get_model(self.model_name)
+        if self.verbose:
+            print(f"✓ Loaded semantic model: {self.model_name}")
+        
+        # Embeddings are unit-normalized and stored as float16; cache entries are
+        # scoped to model and precision
+        self._cache_namespace = f"{self.model_name}|{precision}|unit|f16"
         
         # Pre-compute role embeddings (one-time cost)
         self.role_embeddings = self._compute_role_embeddings()
@@ -56,19 +116,111 @@ class SemanticRoleScorer:
             print(f"✓ Computed embeddings for {len(self.role_embeddings)} roles")
     
     def _compute_role_embeddings(self) -> Dict[str, np.ndarray]:
-        """Embed role definitions into semantic space"""
-        embeddings = {}
-        for role, definition in ROLE_DEFINITIONS.items():
-            # Embed the definition
-            embeddings[role] = self.model.encode(definition, convert_to_numpy=True)
-        return embeddings
+        """Embed role definitions into semantic space (also sets role_names and role_mat)"""
+        # One batched encode for all definitions (cached on disk, definitions are static)
+        self.role_names = tuple(ROLE_DEFINITIONS)
+        role_mat = self._encode([ROLE_DEFINITIONS[role] for role in self.role_names])
+        
+        # One contiguous float32 (R, D) block for the similarity GEMM. Re-normalize
+        # in float32 so fp16 encoder rounding doesn't skew the cosine scores
+        role_mat = np.ascontiguousarray(role_mat, dtype=np.float32)
+        role_mat /= np.linalg.norm(role_mat, axis=1, keepdims=True)
+        self.role_mat = role_mat
+        return dict(zip(self.role_names, role_mat))
+    
+    def _encode(self, sentences: List[str]) -> np.ndarray:
+        """
+        Embed sentences, reusing embeddings cached on disk by earlier runs.
+        
+        Only sentences missing from the cache are sent to the model; their
+        embeddings are written back for next time. Embeddings are kept in
+        float16 (half the cache size and read volume) whether or not they
+        came from the cache, so results don't depend on cache state.
+        
+        The cache is best-effort: it isn't locked against concurrent writers,
+        and any failure to open, read or write it (corrupt entries, full disk)
+        falls back to encoding. It is reset once it grows past
+        EMBEDDING_CACHE_MAX_ENTRIES.
+        
+        Args:
+            sentences: Sentences to embed
+            
+        Returns:
+            (N, D) float16 array of embeddings in input order
+        """
+        cache = self._open_cache()
+        if cache is None:
+            return self._model_encode(sentences)
+        
+        keys = [
+            hashlib.sha256(f"{self._cache_namespace}|{sent}".encode()).hexdigest()
+            for sent in sentences
+        ]
+        new_entries = {}
+        try:
+            try:
+                found = {key: cache[key] for key in set(keys) if key in cache}
+            except Exception:
+                # Corrupt entry or index - treat everything as a miss
+                found = {}
+            missing = {key: sent for key, sent in zip(keys, sentences) if key not in found}
+            if missing:
+                new_entries = dict(zip(missing, self._model_encode(list(missing.values()))))
+                found.update(new_entries)
+        finally:
+            self._close_cache(cache, new_entries)
+        
+        return np.stack([found[key] for key in keys])
+    
+    def _open_cache(self) -> Optional[shelve.Shelf]:
+        """Open the embedding cache, or None if it's disabled or unavailable"""
+        if self._cache_path is None:
+            return None
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache = shelve.open(str(self._cache_path))
+            if len(cache) >= EMBEDDING_CACHE_MAX_ENTRIES:
+                # No per-entry eviction; start over (flag 'n' truncates the files)
+                cache.close()
+                cache = shelve.open(str(self._cache_path), flag='n')
+            return cache
+        except Exception:
+            # Read-only home, locked or corrupt db - just encode
+            return None
+    
+    def _close_cache(self, cache: shelve.Shelf, new_entries: Dict[str, np.ndarray]):
+        """Write new embeddings and close the cache; a failure only costs a re-encode next run"""
+        try:
+            try:
+                for key, emb in new_entries.items():
+                    cache[key] = emb
+            finally:
+                cache.close()
+        except Exception as e:
+            if self.verbose:
+                print(f"⚠ Could not update embedding cache: {e}")
+    
+    def _model_encode(self, sentences: List[str]) -> np.ndarray:
+        """Run the model on sentences, returning unit-length float16 embeddings"""
+        embeddings = self.model.encode(
+            sentences,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return embeddings.astype(np.float16, copy=False)
     
-    def score_resume(self, resume_text: str) -> Dict:
+    def score_resume(self, resume_text: str, on_core: Optional[Callable[[Dict], None]] = None) -> Dict:
         """
         Score resume using semantic similarity.
         
         Args:
             resume_text: Raw resume text to analyze
+            on_core: Called with the role scores (a _score_core result, or the
+                cached result) before the per-sentence breakdown is built, so
+                callers can start work that only needs the scores. Not called
+                for resumes that are too short to score
             
         Returns:
             Dictionary containing:
@@ -79,197 +231,358 @@ class SemanticRoleScorer:
                 - sentence_scores: Detailed per-sentence scores
                 - embedding_dim: Dimension of embeddings used
         """
+        # Scoring is a pure function of the text, so repeat calls are served from memory
+        cache_key = self._score_cache_key(resume_text)
+        cached = self._get_cached_score(cache_key)
+        if cached is not None:
+            if on_core is not None and 'error' not in cached:
+                on_core(cached)
+            return cached
+        
+        result = self._score_core(resume_text)
+        if 'error' not in result:
+            if on_core is not None:
+                on_core(result)
+            result = self._score_details(result)
+        self._cache_score(cache_key, result)
+        return result
+    
+    def score_resumes(self, resume_texts: List[str]) -> List[Dict]:
+        """
+        Score many resumes, embedding all of their sentences in one batch.
+        
+        Args:
+            resume_texts: Raw resume texts to analyze
+            
+        Returns:
+            List of score_resume results, in input order
+        """
+        cache_keys = [self._score_cache_key(text) for text in resume_texts]
+        results = [self._get_cached_score(key) for key in cache_keys]
+        
+        sentence_lists = {
+            i: self._extract_sentences(text)
+            for i, text in enumerate(resume_texts)
+            if results[i] is None
+        }
+        for i, sentences in sentence_lists.items():
+            if len(sentences) < 5:
+                results[i] = self._too_short_result(sentences)
+        
+        # One encode call for every sentence of every resume still to score
+        pending = [i for i in sentence_lists if results[i] is None]
+        all_sentences = [sent for i in pending for sent in sentence_lists[i]]
+        if all_sentences:
+            all_embeddings = self._encode(all_sentences)
+            # One GEMM for all resumes, sliced back per resume
+            all_sims = self._calculate_similarities(all_embeddings)
+            bounds = np.cumsum([0] + [len(sentence_lists[i]) for i in pending]).tolist()
+            sim_matrices = [all_sims[start:end] for start, end in zip(bounds, bounds[1:])]
+            
+            # Softmax every resume's aggregated scores in one (n_resumes, R) pass
+            raw_scores = np.array([
+                list(self._aggregate_scores(sim_matrix, self.role_names).values())
+                for sim_matrix in sim_matrices
+            ])
+            probs = self._softmax_normalize_batch(raw_scores)
+            
+            for i, sim_matrix, row in zip(pending, sim_matrices, probs.tolist()):
+                core = self._core_result(
+                    sentence_lists[i], sim_matrix, dict(zip(self.role_names, row)), all_embeddings.shape[1]
+                )
+                results[i] = self._score_details(core)
+        
+        for i in sentence_lists:
+            self._cache_score(cache_keys[i], results[i])
+        return results
+    
+    def _score_cache_key(self, resume_text: str) -> bytes:
+        """Cache key for the score of a resume"""
+        return hashlib.blake2b(resume_text.encode(), digest_size=16).digest()
+    
+    def _get_cached_score(self, key: bytes) -> Optional[Dict]:
+        """Return a copy of a cached score result, if present"""
+        cached = self._score_cache.get(key)
+        if cached is None:
+            return None
+        self._score_cache.move_to_end(key)
+        return copy.deepcopy(cached)
+    
+    def _cache_score(self, key: bytes, result: Dict):
+        """Store a private copy of a score result, evicting the least recently used entry when full"""
+        self._score_cache[key] = copy.deepcopy(result)
+        if len(self._score_cache) > SCORE_CACHE_SIZE:
+            self._score_cache.popitem(last=False)
+    
+    def _score_core(self, resume_text: str) -> Dict:
+        """
+        Role scores for a resume, without the per-sentence breakdown.
+        
+        Everything summary generation depends on is computed here, so
+        score_resume's on_core callers can start generating while
+        _score_details runs.
+        
+        Args:
+            resume_text: Raw resume text to analyze
+            
+        Returns:
+            score_resume's result minus top_sentences and sentence_scores, plus
+            the extracted sentences for _score_details (or the too-short error)
+        """
         # Extract sentences
         sentences = self._extract_sentences(resume_text)
         
         if len(sentences) < 5:
-            return {
-                'scores': {role: 0.25 for role in ROLE_DEFINITIONS},
-                'dominant_role': 'Unknown',
-                'confidence': 0.25,
-                'top_sentences': [],
-                'total_sentences': len(sentences),
-                'error': 'Resume too short (<5 substantive sentences)'
-            }
+            return self._too_short_result(sentences)
         
         # Embed all sentences at once (batched for speed)
-        sentence_embeddings = self.model.encode(sentences, convert_to_numpy=True)
-        
-        # Calculate similarity to each role
-        role_similarities = self._calculate_similarities(sentence_embeddings, sentences)
+        return self._score_sentences(sentences, self._encode(sentences))
+    
+    def _too_short_result(self, sentences: List[str]) -> Dict:
+        """Result for a resume with too few substantive sentences to score"""
+        return {
+            'scores': {role: 0.25 for role in ROLE_DEFINITIONS},
+            'dominant_role': 'Unknown',
+            'confidence': 0.25,
+            'top_sentences': [],
+            'total_sentences': len(sentences),
+            'error': 'Resume too short (<5 substantive sentences)'
+        }
+    
+    def _score_sentences(self, sentences: List[str], sentence_embeddings: np.ndarray) -> Dict:
+        """_score_core for already extracted and embedded sentences"""
+        # Calculate similarity to each role: (N, R), columns follow self.role_names
+        sim_matrix = self._calculate_similarities(sentence_embeddings)
         
         # Aggregate with attention weighting
-        role_scores = self._aggregate_scores(role_similarities)
+        role_scores = self._aggregate_scores(sim_matrix, self.role_names)
         
         # Normalize with softmax
         normalized_scores = self._softmax_normalize(role_scores, temperature=SOFTMAX_TEMPERATURE)
         
+        return self._core_result(sentences, sim_matrix, normalized_scores, sentence_embeddings.shape[1])
+    
+    def _core_result(
+        self,
+        sentences: List[str],
+        sim_matrix: np.ndarray,
+        normalized_scores: Dict[str, float],
+        embedding_dim: int
+    ) -> Dict:
+        """Assemble a _score_core result from a resume's normalized role scores"""
         # Determine dominant role
         dominant_role = max(normalized_scores.items(), key=lambda x: x[1])[0]
         confidence = normalized_scores[dominant_role]
         
-        # Get top evidence sentences
-        top_sentences = self._get_top_sentences(role_similarities, dominant_role, sentences)
-        
-        # Create detailed sentence scores for logging
-        sentence_scores = self._create_sentence_scores(role_similarities, sentences)
-        
         return {
             'scores': normalized_scores,
             'dominant_role': dominant_role,
             'confidence': confidence,
-            'top_sentences': top_sentences[:3],
             'total_sentences': len(sentences),
             'sentences_used': len(sentences),
-            'sentence_scores': sentence_scores,
-            'raw_similarities': role_similarities,
-            'embedding_dim': sentence_embeddings.shape[1] if len(sentence_embeddings) > 0 else 0
+            'sentences': sentences,
+            'raw_similarities': sim_matrix,
+            'embedding_dim': embedding_dim
         }
     
-    def _extract_sentences(self, text: str) -> List[str]:
-        """Extract substantive sentences from resume"""
-        lines = text.split('\n')
-        sentences = []
+    def _score_details(self, core: Dict) -> Dict:
+        """
+        Complete a _score_core result with evidence and per-sentence scores.
         
-        for line in lines:
-            line = line.strip()
-            # Skip empty lines and headers
-            if not line or len(line) < 5:
-                continue
+        Args:
+            core: Result of _score_core for a resume that scored successfully
             
+        Returns:
+            The full score_resume result
+        """
+        result = dict(core)
+        sentences = result.pop('sentences')
+        sim_matrix = result['raw_similarities']
+        
+        # Get top evidence sentences
+        result['top_sentences'] = self._get_top_sentences(
+            sim_matrix, self.role_names.index(result['dominant_role']), sentences
+        )
+        
+        # Create detailed sentence scores for logging
+        result['sentence_scores'] = self._create_sentence_scores(sim_matrix, sentences, self.role_names)
+        
+        return result
+    
+    def _extract_sentences(self, text: Union[str, bytes]) -> List[str]:
+        """Extract substantive sentences from resume (str or UTF-8 bytes)"""
+        data = text.encode('utf-8') if isinstance(text, str) else bytes(text)
+        buf = np.frombuffer(data, dtype=np.uint8)
+        
+        # Every sentence ending or line break closes a span. UTF-8 never uses
+        # ASCII byte values inside multi-byte characters, so byte offsets are safe
+        breaks = np.flatnonzero(_SPAN_BREAK[buf])
+        starts = np.concatenate(([0], breaks + 1))
+        ends = np.append(breaks, len(buf))
+        # Spans that open a line may start with a bullet
+        opens_line = np.ones(len(starts), dtype=bool)
+        opens_line[1:] = buf[breaks] == ord('\n')
+        
+        # 5+ words need at least 9 bytes, so shorter spans are never decoded
+        candidates = np.flatnonzero(ends - starts >= 9)
+        
+        sentences = []
+        for start, end, is_line_start in zip(
+            starts[candidates].tolist(), ends[candidates].tolist(), opens_line[candidates].tolist()
+        ):
+            sent = data[start:end].decode('utf-8', errors='replace').strip()
             # Remove bullet points and dashes
-            line = re.sub(r'^[-•*]\s*', '', line)
-            line = line.strip()
+            if is_line_start:
+                sent = _BULLET_RE.sub('', sent).strip()
             
-            # Split by sentence endings
-            line_sentences = re.split(r'[.!?]+', line)
-            for sent in line_sentences:
-                sent = sent.strip()
-                if not sent:
-                    continue
-                
-                # Keep if >= 5 words (more lenient for bullet points)
-                words = sent.split()
-                if len(words) >= 5:
-                    alpha_ratio = sum(c.isalpha() for c in sent) / max(len(sent), 1)
-                    if alpha_ratio > 0.4:  # More lenient for technical content
-                        # Remove common boilerplate
-                        if not any(phrase in sent.lower() for phrase in [
-                            'references available', 'upon request', 'email:', 'phone:',
-                            'education:', 'skills:', 'experience:'
-                        ]):
-                            sentences.append(sent)
+            # Keep if >= 5 words (more lenient for bullet points)
+            if len(sent.split()) >= 5:
+                alpha_ratio = len(_NON_ALPHA_RE.sub('', sent)) / len(sent)
+                # More lenient for technical content; drop common boilerplate
+                if alpha_ratio > 0.4 and _BOILER_RE.search(sent) is None:
+                    sentences.append(sent)
         
         return sentences
     
-    def _calculate_similarities(
-        self, 
-        sentence_embeddings: np.ndarray, 
-        sentences: List[str]
-    ) -> Dict[str, List[Tuple[float, str]]]:
-        """Calculate cosine similarity between sentences and roles"""
-        from sklearn.metrics.pairwise import cosine_similarity
-        
-        role_sims = {role: [] for role in ROLE_DEFINITIONS}
-        
-        for sent_emb, sent_text in zip(sentence_embeddings, sentences):
-            for role, role_emb in self.role_embeddings.items():
-                # Cosine similarity
-                sim = cosine_similarity(
-                    sent_emb.reshape(1, -1), 
-                    role_emb.reshape(1, -1)
-                )[0][0]
-                role_sims[role].append((sim, sent_text))
-        
-        return role_sims
-    
-    def _aggregate_scores(self, role_similarities: Dict[str, List[Tuple[float, str]]]) -> Dict[str, float]:
-        """Aggregate with attention weighting - top sentences matter more"""
-        scores = {}
+    def _calculate_similarities(self, sentence_embeddings: np.ndarray) -> np.ndarray:
+        """
+        Calculate cosine similarity between sentences and roles.
         
-        for role, sims in role_similarities.items():
-            # Sort by similarity
-            sorted_sims = sorted([s[0] for s in sims], reverse=True)
-            
-            if not sorted_sims:
-                scores[role] = 0.0
-                continue
-            
-            # Attention weighting: top 30% get 2x, middle 40% get 1x, bottom 30% get 0.5x
-            n = len(sorted_sims)
-            top_30 = int(n * ATTENTION_TOP_PERCENT)
-            mid_70 = int(n * ATTENTION_MID_PERCENT)
+        Args:
+            sentence_embeddings: (N, D) unit-length sentence embeddings
+                (float16 input from _encode is widened to float32)
             
-            top_score = np.mean(sorted_sims[:top_30]) if top_30 > 0 else 0
-            mid_score = np.mean(sorted_sims[top_30:mid_70]) if mid_70 > top_30 else 0
-            bottom_score = np.mean(sorted_sims[mid_70:]) if len(sorted_sims) > mid_70 else 0
+        Returns:
+            (N, R) similarity matrix, columns ordered as self.role_names
+        """
+        # Embeddings are unit length, so one GEMM gives all cosine similarities
+        return sentence_embeddings.astype(np.float32, copy=False) @ self.role_mat.T
+    
+    def _aggregate_scores(
+        self,
+        role_similarities: Union[np.ndarray, Dict[str, List[Tuple[float, str]]]],
+        role_names: Sequence[str] = None
+    ) -> Dict[str, float]:
+        """
+        Aggregate with attention weighting - top sentences matter more.
+        
+        Args:
+            role_similarities: (N, R) similarity matrix, or per-role lists of
+                (similarity, sentence) pairs
+            role_names: Role for each matrix column (ignored for the dict form)
             
-            # Weighted combination
-            total_weight = ATTENTION_TOP_WEIGHT + ATTENTION_MID_WEIGHT + ATTENTION_BOTTOM_WEIGHT
-            scores[role] = (
-                ATTENTION_TOP_WEIGHT * top_score + 
-                ATTENTION_MID_WEIGHT * mid_score + 
-                ATTENTION_BOTTOM_WEIGHT * bottom_score
-            ) / total_weight
-        
-        return scores
+        Returns:
+            Aggregated score per role
+        """
+        if isinstance(role_similarities, dict):
+            # Pull the similarities straight into one (N, R) array, column per role
+            role_names = tuple(role_similarities)
+            sim_matrix = np.empty((len(next(iter(role_similarities.values()), ())), len(role_names)))
+            for col, sims in enumerate(role_similarities.values()):
+                sim_matrix[:, col] = np.fromiter(map(itemgetter(0), sims), dtype=np.float64, count=len(sims))
+        else:
+            sim_matrix = role_similarities
+        
+        n = sim_matrix.shape[0]
+        if n == 0:
+            return {role: 0.0 for role in role_names}
+        
+        # Attention weighting: top 30% get 2x, middle 40% get 1x, bottom 30% get 0.5x
+        top_30 = int(n * ATTENTION_TOP_PERCENT)
+        mid_70 = int(n * ATTENTION_MID_PERCENT)
+        
+        # Partial sort each column (descending) - only the slice boundaries matter.
+        # A boundary at n needs no partitioning (and isn't a valid kth)
+        kth = [k for k in (top_30, mid_70) if k < n]
+        part = -np.partition(-sim_matrix, kth, axis=0) if kth else sim_matrix
+        zeros = np.zeros(sim_matrix.shape[1], dtype=sim_matrix.dtype)
+        top_score = part[:top_30].mean(axis=0) if top_30 > 0 else zeros
+        mid_score = part[top_30:mid_70].mean(axis=0) if mid_70 > top_30 else zeros
+        bottom_score = part[mid_70:].mean(axis=0) if n > mid_70 else zeros
+        
+        # Weighted combination
+        total_weight = ATTENTION_TOP_WEIGHT + ATTENTION_MID_WEIGHT + ATTENTION_BOTTOM_WEIGHT
+        scores = (
+            ATTENTION_TOP_WEIGHT * top_score + 
+            ATTENTION_MID_WEIGHT * mid_score + 
+            ATTENTION_BOTTOM_WEIGHT * bottom_score
+        ) / total_weight
+        
+        return dict(zip(role_names, scores.tolist()))
     
     def _softmax_normalize(self, scores: Dict[str, float], temperature: float = None) -> Dict[str, float]:
         """Softmax normalization with temperature scaling"""
         if temperature is None:
             temperature = SOFTMAX_TEMPERATURE
-            
-        score_array = np.array(list(scores.values()))
         
-        # Temperature scaling
-        score_array = score_array / temperature
+        # Online softmax: one pass keeps a running max and a normalizer rescaled
+        # to it, so the scores are only read once before emitting
+        max_logit = -math.inf
+        normalizer = 0.0
+        for score in scores.values():
+            logit = score / temperature
+            if logit > max_logit:
+                normalizer = normalizer * math.exp(max_logit - logit) + 1.0
+                max_logit = logit
+            else:
+                normalizer += math.exp(logit - max_logit)
         
-        # Softmax with numerical stability
-        exp_scores = np.exp(score_array - np.max(score_array))
-        softmax_scores = exp_scores / exp_scores.sum()
+        return {
+            role: math.exp(score / temperature - max_logit) / normalizer
+            for role, score in scores.items()
+        }
+    
+    def _softmax_normalize_batch(self, score_matrix: np.ndarray, temperature: float = None) -> np.ndarray:
+        """
+        Row-wise softmax with temperature scaling for many resumes at once.
         
-        return {role: float(score) for role, score in zip(scores.keys(), softmax_scores)}
+        Args:
+            score_matrix: (n_resumes, R) aggregated role scores
+            temperature: Softmax temperature (defaults to SOFTMAX_TEMPERATURE)
+            
+        Returns:
+            (n_resumes, R) array of probabilities, each row summing to 1
+        """
+        if temperature is None:
+            temperature = SOFTMAX_TEMPERATURE
+        
+        probs = score_matrix / temperature
+        # Subtract each row's max for numerical stability, then work in place
+        probs -= probs.max(axis=1, keepdims=True)
+        np.exp(probs, out=probs)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs
     
     def _get_top_sentences(
         self, 
-        role_similarities: Dict[str, List[Tuple[float, str]]], 
-        role: str,
+        sim_matrix: np.ndarray, 
+        role_idx: int,
         sentences: List[str]
     ) -> List[str]:
-        """Get sentences most similar to the role"""
-        sims = role_similarities[role]
-        # Sort by similarity, get top 3
-        sorted_sims = sorted(sims, key=lambda x: x[0], reverse=True)
-        return [sent for _, sent in sorted_sims[:3]]
+        """Get sentences most similar to the role (column role_idx)"""
+        scores = sim_matrix[:, role_idx]
+        # Highest similarity first, ties in document order (as a stable sort would),
+        # including ties that straddle the top-3 cutoff
+        top_idx = np.lexsort((np.arange(len(scores)), -scores))[:3]
+        return [sentences[i] for i in top_idx.tolist()]
     
     def _create_sentence_scores(
         self,
-        role_similarities: Dict[str, List[Tuple[float, str]]],
-        sentences: List[str]
+        sim_matrix: np.ndarray,
+        sentences: List[str],
+        role_names: Sequence[str]
     ) -> List[Dict]:
-        """Create detailed score breakdown for each sentence"""
-        sentence_scores = []
+        """Create detailed score breakdown for each sentence (matrix columns follow role_names)"""
+        best_idx = sim_matrix.argmax(axis=1).tolist()
         
-        # Create a mapping from sentence text to its scores
-        for idx, sentence in enumerate(sentences):
-            scores_for_sentence = {}
-            for role in ROLE_DEFINITIONS.keys():
-                # Find this sentence's similarity score for this role
-                sims = role_similarities[role]
-                if idx < len(sims):
-                    similarity, _ = sims[idx]
-                    scores_for_sentence[role] = float(similarity)
-            
-            # Find which role this sentence matches best
-            best_role = max(scores_for_sentence.items(), key=lambda x: x[1])[0] if scores_for_sentence else 'Unknown'
-            best_score = scores_for_sentence.get(best_role, 0.0)
-            
+        sentence_scores = []
+        for idx, (sentence, row, best) in enumerate(zip(sentences, sim_matrix.tolist(), best_idx)):
             sentence_scores.append({
                 'sentence': sentence,
                 'sentence_index': idx,
-                'role_scores': scores_for_sentence,
-                'best_match_role': best_role,
-                'best_match_score': float(best_score)
+                'role_scores': dict(zip(role_names, row)),
+                'best_match_role': role_names[best],
+                'best_match_score': row[best]
             })
         
         return sentence_scores
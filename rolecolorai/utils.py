@@ -6,7 +6,29 @@ Helper functions for file I/O and data export.
 
 import json
 import os
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+    
+    def _dumps(data: Any) -> bytes:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    
+    _loads = orjson.loads
+except ImportError:
+    def _json_default(obj: Any) -> Any:
+        # NumPy scalars and arrays, which orjson serializes natively
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+    
+    _loads = json.loads
 
 
 def load_resume_from_file(filepath: str) -> str:
@@ -24,14 +46,46 @@ def load_resume_from_file(filepath: str) -> str:
         Exception: For other file reading errors
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
+        # One binary read and decode; undecodable bytes become U+FFFD
+        with open(filepath, 'rb') as f:
+            text = f.read().decode('utf-8', errors='replace')
+        # Same newlines text mode would give
+        return text.replace('\r\n', '\n').replace('\r', '\n')
     except FileNotFoundError:
         raise FileNotFoundError(f"Resume file not found: {filepath}")
     except Exception as e:
         raise Exception(f"Error reading resume file: {e}")
 
 
+def write_json(data: Any, output_file: str) -> None:
+    """
+    Write data to a JSON file with 2-space indentation.
+    
+    Uses orjson's C encoder when installed, falling back to the standard
+    library json module otherwise.
+    
+    Args:
+        data: JSON-serializable data (NumPy scalars and arrays allowed)
+        output_file: Output file path
+    """
+    with open(output_file, 'wb') as f:
+        f.write(_dumps(data))
+
+
+def read_json(input_file: str) -> Any:
+    """
+    Read a JSON file written by write_json.
+    
+    Args:
+        input_file: Input file path
+        
+    Returns:
+        Decoded JSON data
+    """
+    with open(input_file, 'rb') as f:
+        return _loads(f.read())
+
+
 def export_sentence_scores(result: Dict, output_file: Optional[str] = None) -> Optional[str]:
     """
     Export detailed sentence scores to a separate JSON file.
@@ -63,8 +117,7 @@ def export_sentence_scores(result: Dict, output_file: Optional[str] = None) -> O
     
     os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else 'output', exist_ok=True)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(export_data, f, indent=2, ensure_ascii=False)
+    write_json(export_data, output_file)
     
     print(f"💾 Sentence scores exported to: {output_file}")
     return output_file
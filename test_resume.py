@@ -2,41 +2,148 @@
 Test suite for RoleColorAI Resume Analysis System
 """
 
+import asyncio
+import dbm.dumb
+import json
+import shelve
 import unittest
 import sys
 import os
+import tempfile
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from rolecolorai import generator as generator_module
+from rolecolorai.config import (
+    ATTENTION_TOP_PERCENT,
+    ATTENTION_MID_PERCENT,
+    ATTENTION_TOP_WEIGHT,
+    ATTENTION_MID_WEIGHT,
+    ATTENTION_BOTTOM_WEIGHT,
+    SOFTMAX_TEMPERATURE
+)
 from rolecolorai import (
     SemanticRoleScorer,
     SummaryGenerator,
     RoleColorPipeline,
     ROLE_DEFINITIONS,
+    ROLE_DEFINITION_LENGTHS,
     load_resume_from_file
 )
 
+# Resume fixtures shared across tests, built once at import
+_RESUME_EXTRACT = "This is a test sentence. This is another one! And a third? Yes, it is."
+# UTF-8 form for the scorer's byte-level sentence splitter
+_RESUME_EXTRACT_BYTES = _RESUME_EXTRACT.encode('utf-8')
+
+_RESUME_SUMMARY = """John Doe
+Software Engineer
+
+Summary:
+Experienced software engineer with 5 years in backend development.
+Skilled in Python and microservices.
+
+Professional Experience:
+Worked at various companies..."""
+
+_RESUME_ANALYZE = """
+        Software Engineer
+        
+        Summary:
+        Experienced engineer with Python and AWS skills.
+        
+        Experience:
+        - Built scalable systems
+        - Led technical initiatives
+        """
+
+# Long enough to score (5+ substantive sentences); the variant repeats its
+# sentences, so batch scoring sees duplicates across resumes
+_RESUME_LONG = """
+        Senior Backend Engineer
+        - Designed and built a payments platform processing two million transactions daily
+        - Mentored six engineers and ran the weekly architecture review
+        - Migrated monolithic services to Kubernetes with zero downtime
+        - Partnered with product managers to define the quarterly roadmap
+        - Automated deployment pipelines, cutting release time from hours to minutes
+        - Resolved production incidents as part of the on-call rotation
+        """
+_RESUME_LONG_VARIANT = _RESUME_LONG + """
+        - Introduced contract testing across twelve services owned by four teams
+        - Wrote onboarding documentation adopted by the whole engineering group
+        """
+
+
+def _reference_attention(sims, mid_percent=ATTENTION_MID_PERCENT):
+    """Attention aggregation of one role's similarities, sorted-list reference"""
+    sorted_sims = sorted(sims, reverse=True)
+    n = len(sorted_sims)
+    top_30 = int(n * ATTENTION_TOP_PERCENT)
+    mid_70 = int(n * mid_percent)
+    top_score = np.mean(sorted_sims[:top_30]) if top_30 > 0 else 0
+    mid_score = np.mean(sorted_sims[top_30:mid_70]) if mid_70 > top_30 else 0
+    bottom_score = np.mean(sorted_sims[mid_70:]) if n > mid_70 else 0
+    total_weight = ATTENTION_TOP_WEIGHT + ATTENTION_MID_WEIGHT + ATTENTION_BOTTOM_WEIGHT
+    return (
+        ATTENTION_TOP_WEIGHT * top_score +
+        ATTENTION_MID_WEIGHT * mid_score +
+        ATTENTION_BOTTOM_WEIGHT * bottom_score
+    ) / total_weight
+
+
+class _FakeModel:
+    """SentenceTransformer stand-in with deterministic per-text embeddings"""
+
+    def encode(self, sentences, normalize_embeddings=False, **kwargs):
+        embeddings = np.stack([
+            np.random.default_rng(list(sentence.encode())).standard_normal(32)
+            for sentence in sentences
+        ]).astype(np.float32)
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
+
+
+def _fake_model_scorer() -> SemanticRoleScorer:
+    """Real scorer backed by _FakeModel, without the disk cache"""
+    with patch('rolecolorai.scorer._get_model', return_value=(_FakeModel(), 'fp32')):
+        return SemanticRoleScorer(verbose=False, cache_dir=None)
+
+
+class _ScorerStub:
+    """Scorer stand-in carrying the real methods that don't need the model"""
+    verbose = False
+    _extract_sentences = SemanticRoleScorer._extract_sentences
+    _softmax_normalize = SemanticRoleScorer._softmax_normalize
+    _softmax_normalize_batch = SemanticRoleScorer._softmax_normalize_batch
+    _aggregate_scores = SemanticRoleScorer._aggregate_scores
+    _get_top_sentences = SemanticRoleScorer._get_top_sentences
+    _create_sentence_scores = SemanticRoleScorer._create_sentence_scores
+    _encode = SemanticRoleScorer._encode
+    _open_cache = SemanticRoleScorer._open_cache
+    _close_cache = SemanticRoleScorer._close_cache
+    _model_encode = SemanticRoleScorer._model_encode
+
 
 class TestSemanticRoleScorer(unittest.TestCase):
     """Test semantic scoring functionality"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create a mock scorer without initializing the real model
-        # We'll test individual methods that don't require the model
-        self.scorer = Mock(spec=SemanticRoleScorer)
-        # Set up mock methods for testing
-        self.scorer._extract_sentences = SemanticRoleScorer._extract_sentences.__get__(self.scorer, SemanticRoleScorer)
-        self.scorer._softmax_normalize = SemanticRoleScorer._softmax_normalize.__get__(self.scorer, SemanticRoleScorer)
-        self.scorer._aggregate_scores = SemanticRoleScorer._aggregate_scores.__get__(self.scorer, SemanticRoleScorer)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures"""
+        # A stub scorer without the real model, once per class. We'll test
+        # individual methods that don't require the model; they keep no state
+        # on the scorer
+        cls.scorer = _ScorerStub()
     
     def test_extract_sentences(self):
         """Test sentence extraction"""
-        text = "This is a test sentence. This is another one! And a third? Yes, it is."
-        sentences = self.scorer._extract_sentences(text)
+        sentences = self.scorer._extract_sentences(_RESUME_EXTRACT_BYTES)
         self.assertGreater(len(sentences), 0)
         self.assertIsInstance(sentences, list)
     
@@ -46,21 +153,27 @@ class TestSemanticRoleScorer(unittest.TestCase):
         sentences = self.scorer._extract_sentences(text)
         # Short sentence should be filtered out (minimum 5 words)
         self.assertTrue(all(len(s.split()) >= 5 for s in sentences))
+
+    def test_extract_sentences_bullets_and_bytes(self):
+        """Test bullets are stripped and UTF-8 bytes give the same sentences"""
+        text = "• Led the café platform team for years!\n- Built résumé parsing services at scale.\nShort."
+        sentences = self.scorer._extract_sentences(text)
+        self.assertEqual(sentences, [
+            'Led the café platform team for years',
+            'Built résumé parsing services at scale'
+        ])
+        self.assertEqual(self.scorer._extract_sentences(text.encode('utf-8')), sentences)
     
     def test_softmax_normalize(self):
         """Test softmax normalization"""
         scores = {'Builder': 0.8, 'Enabler': 0.6, 'Thriver': 0.4, 'Supportee': 0.2}
         normalized = self.scorer._softmax_normalize(scores)
         
-        # Check all roles present
-        self.assertEqual(set(normalized.keys()), set(scores.keys()))
-        
-        # Check probabilities sum to 1
-        total = sum(normalized.values())
-        self.assertAlmostEqual(total, 1.0, places=5)
-        
-        # Check all values are positive
-        self.assertTrue(all(v > 0 for v in normalized.values()))
+        # All roles present, probabilities sum to 1, all values positive
+        self.assertEqual(
+            (set(normalized), round(sum(normalized.values()), 5), all(v > 0 for v in normalized.values())),
+            (set(scores), 1.0, True)
+        )
     
     @unittest.skip("Requires model initialization")
     def test_score_resume_short_text(self):
@@ -77,10 +190,176 @@ class TestSemanticRoleScorer(unittest.TestCase):
         
         scores = self.scorer._aggregate_scores(role_similarities)
         
-        self.assertIn('Builder', scores)
-        self.assertIn('Enabler', scores)
-        self.assertIsInstance(scores['Builder'], float)
-        self.assertIsInstance(scores['Enabler'], float)
+        self.assertEqual(
+            {role: type(score) for role, score in scores.items()},
+            {'Builder': float, 'Enabler': float}
+        )
+
+    def test_aggregate_and_softmax_match_reference(self):
+        """Test matrix aggregation plus softmax against the sorted-list reference"""
+        role_names = ('Builder', 'Enabler', 'Thriver', 'Supportee')
+        rng = np.random.default_rng(0)
+        # A mid cut-off of 1.0 leaves the bottom tier empty
+        for mid_percent in (ATTENTION_MID_PERCENT, 1.0):
+            for n in range(1, 13):
+                sim_matrix = rng.uniform(-1, 1, (n, len(role_names))).astype(np.float32)
+                with self.subTest(mid_percent=mid_percent, n=n), \
+                        patch('rolecolorai.scorer.ATTENTION_MID_PERCENT', mid_percent):
+                    scores = self.scorer._aggregate_scores(sim_matrix, role_names)
+                    expected = [_reference_attention(col.tolist(), mid_percent) for col in sim_matrix.T]
+                    np.testing.assert_allclose(list(scores.values()), expected, rtol=1e-5, atol=1e-6)
+                    
+                    logits = np.array(expected) / SOFTMAX_TEMPERATURE
+                    expected_probs = np.exp(logits - logits.max())
+                    expected_probs /= expected_probs.sum()
+                    probs = self.scorer._softmax_normalize(scores)
+                    np.testing.assert_allclose(list(probs.values()), expected_probs, rtol=1e-5)
+                    # Row-wise batch variant used by score_resumes
+                    batch_probs = self.scorer._softmax_normalize_batch(np.array([expected, expected[::-1]]))
+                    np.testing.assert_allclose(batch_probs[0], expected_probs, rtol=1e-5)
+                    np.testing.assert_allclose(batch_probs[1], expected_probs[::-1], rtol=1e-5)
+
+    def test_similarity_matrix_helpers(self):
+        """Test evidence and per-sentence scores derived from one similarity matrix"""
+        role_names = ('Builder', 'Enabler')
+        sentences = ['s0', 's1', 's2', 's3', 's4']
+        sim_matrix = np.array([
+            [0.1, 0.9], [0.8, 0.2], [0.3, 0.4], [0.9, 0.1], [0.5, 0.6]
+        ], dtype=np.float32)
+
+        self.assertEqual(self.scorer._get_top_sentences(sim_matrix, 0, sentences), ['s3', 's1', 's4'])
+        # Ties across the top-3 cutoff resolve to the earliest sentences
+        tied = np.array([[0.5], [0.7], [0.5], [0.5], [0.5]], dtype=np.float32)
+        self.assertEqual(self.scorer._get_top_sentences(tied, 0, sentences), ['s1', 's0', 's2'])
+
+        sentence_scores = self.scorer._create_sentence_scores(sim_matrix, sentences, role_names)
+        self.assertEqual(len(sentence_scores), 5)
+        self.assertEqual(sentence_scores[0]['best_match_role'], 'Enabler')
+        self.assertEqual(sentence_scores[3]['best_match_role'], 'Builder')
+        self.assertAlmostEqual(sentence_scores[3]['role_scores']['Builder'], 0.9, places=5)
+
+    def test_encode_uses_disk_cache(self):
+        """Test cached sentences are not re-encoded"""
+        sentences = ['First sentence here', 'Second sentence here', 'First sentence here']
+        # Own scorer: this test needs model and cache state
+        scorer = _ScorerStub()
+        scorer._cache_namespace = 'test-model|fp32|unit|f16'
+        scorer.model = Mock()
+        scorer.model.encode.side_effect = lambda sents, **kwargs: np.array(
+            [[float(len(s)), 1.0] for s in sents]
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            scorer._cache_path = Path(tmp_dir) / 'emb_cache'
+            first = scorer._encode(sentences)
+            second = scorer._encode(sentences)
+
+        self.assertEqual(first.shape, (3, 2))
+        self.assertEqual(first.dtype, np.float16)
+        np.testing.assert_array_equal(first, second)
+        # Duplicates are encoded once, and the second call is served from cache
+        self.assertEqual(scorer.model.encode.call_count, 1)
+        self.assertEqual(len(scorer.model.encode.call_args[0][0]), 2)
+
+    def test_encode_cache_failures_fall_back(self):
+        """Test a corrupt, unwritable or disabled cache only costs a re-encode"""
+        sentences = ['First sentence here', 'Second sentence here']
+        scorer = _ScorerStub()
+        scorer._cache_namespace = 'test-model|fp32|unit|f16'
+        scorer.model = Mock()
+        scorer.model.encode.side_effect = lambda sents, **kwargs: np.array(
+            [[float(len(s)), 1.0] for s in sents]
+        )
+        expected = scorer._model_encode(sentences)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            scorer._cache_path = Path(tmp_dir) / 'emb_cache'
+            # Full disk: the write fails, the embeddings are still returned
+            with patch('shelve.Shelf.__setitem__', side_effect=OSError('No space left on device')):
+                np.testing.assert_array_equal(scorer._encode(sentences), expected)
+            
+            # Corrupt entries fail to unpickle and are re-encoded
+            scorer._encode(sentences)
+            with dbm.dumb.open(str(scorer._cache_path), 'w') as raw:
+                for key in raw.keys():
+                    raw[key] = b'not a pickle'
+            np.testing.assert_array_equal(scorer._encode(sentences), expected)
+            
+            # A full cache is reset rather than growing without bound
+            with patch('rolecolorai.scorer.EMBEDDING_CACHE_MAX_ENTRIES', 2):
+                scorer._encode(['Third sentence here'])
+            with shelve.open(str(scorer._cache_path)) as cache:
+                self.assertEqual(len(cache), 1)
+        
+        # Disabled cache: every call encodes
+        scorer._cache_path = None
+        scorer.model.encode.reset_mock()
+        scorer._encode(sentences)
+        scorer._encode(sentences)
+        self.assertEqual(scorer.model.encode.call_count, 2)
+
+    def test_score_resumes_matches_score_resume(self):
+        """Test batch scoring agrees with scoring each resume on its own"""
+        batch_scorer = _fake_model_scorer()
+        # Already cached, too short, normal, and a duplicate of the first
+        batch_scorer.score_resume(_RESUME_LONG_VARIANT)
+        texts = [_RESUME_LONG, _RESUME_ANALYZE, _RESUME_LONG_VARIANT, _RESUME_LONG]
+        batch_results = batch_scorer.score_resumes(texts)
+
+        single_scorer = _fake_model_scorer()
+        for i, (text, batch) in enumerate(zip(texts, batch_results)):
+            single = single_scorer.score_resume(text)
+            with self.subTest(resume=i):
+                self.assertEqual(batch.keys(), single.keys())
+                self.assertEqual(batch.get('error'), single.get('error'))
+                self.assertEqual(batch['dominant_role'], single['dominant_role'])
+                self.assertEqual(batch['top_sentences'], single['top_sentences'])
+                for role, score in single['scores'].items():
+                    self.assertAlmostEqual(batch['scores'][role], score, places=6)
+                if 'raw_similarities' in single:
+                    np.testing.assert_allclose(batch['raw_similarities'], single['raw_similarities'], rtol=1e-6)
+                    self.assertEqual(
+                        [entry['sentence'] for entry in batch['sentence_scores']],
+                        [entry['sentence'] for entry in single['sentence_scores']]
+                    )
+
+        # Duplicates get their own copies
+        self.assertIsNot(batch_results[0], batch_results[3])
+        self.assertIn('error', batch_results[1])
+
+
+def _chat_response(content: str, prompt_tokens: int = 100, completion_tokens: int = 50):
+    """Chat completion response shaped like the OpenAI SDK's"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            prompt_tokens_details=None
+        )
+    )
+
+
+class _FakeAsyncOpenAI:
+    """AsyncOpenAI stand-in that, like the real client, only works on its first event loop"""
+    
+    def __init__(self, api_key=None, **kwargs):
+        self.loop = None
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+    
+    async def _create(self, **kwargs):
+        loop = asyncio.get_running_loop()
+        self.loop = self.loop or loop
+        if self.closed or self.loop is not loop:
+            raise RuntimeError('Event loop is closed')
+        return _chat_response('{"summary": "One. Two. Three. Four."}')
 
 
 class TestSummaryGenerator(unittest.TestCase):
@@ -104,7 +383,42 @@ class TestSummaryGenerator(unittest.TestCase):
         # Skills are now capitalized (Python, Java, AWS), so check case-insensitive
         skill_names = [s.lower() for s in metadata['skills']]
         self.assertIn('python', skill_names)
-    
+
+    def test_extract_metadata_skills_whole_words(self):
+        """Test skills only match whole words"""
+        text = "Good communicator who enjoys mentoring and machine learning"
+        metadata = self.generator._extract_metadata(text)
+        self.assertEqual(metadata['skills'], ['Machine Learning'])
+
+    def test_extract_metadata_skills_in_order(self):
+        """Test skills are deduplicated in order of first appearance"""
+        text = "Kafka and Redis pipelines in Python; more Kafka, then Docker"
+        metadata = self.generator._extract_metadata(text)
+        self.assertEqual(metadata['skills'], ['Kafka', 'Redis', 'Python', 'Docker'])
+
+    @unittest.skipIf(generator_module._SKILL_AC is None, "pyahocorasick not installed")
+    def test_skill_matchers_agree(self):
+        """Test the Aho-Corasick scan matches the regex fallback"""
+        text = ("JavaScript and Java engineer; PostgreSQL, not sql-ish mySQL. "
+                "Go, Golang, node_js, Node, machine learning and data science APIs")
+        with patch.object(generator_module, '_SKILL_AC', None):
+            expected = generator_module._find_skills(text)
+        self.assertEqual(generator_module._find_skills(text), expected)
+
+    def test_optimize_resume_extract(self):
+        """Test resume extract is capped at max_words"""
+        text = "Built distributed systems at scale\n" * 100
+        extract = self.generator._optimize_resume_extract(text, max_words=20)
+        self.assertEqual(len(extract.split()), 20)
+
+        short_text = "Built distributed systems at scale."
+        self.assertEqual(self.generator._optimize_resume_extract(short_text, max_words=20), short_text)
+        # Short resumes get the same whitespace collapsing as long ones
+        self.assertEqual(
+            self.generator._optimize_resume_extract("  Built distributed\n    systems at scale.\n", max_words=20),
+            short_text
+        )
+
     def test_template_generation(self):
         """Test template-based summary generation"""
         role_scores = {
@@ -128,54 +442,147 @@ class TestSummaryGenerator(unittest.TestCase):
         """Test template generation for all role types"""
         roles = ['Builder', 'Enabler', 'Thriver', 'Supportee']
         
+        role_scores_list = []
         for role in roles:
             role_scores = {r: 0.25 for r in roles}
             role_scores[role] = 0.5  # Make this dominant
+            role_scores_list.append(role_scores)
+        
+        # All roles go through the batch template path in one call
+        results = self.generator.generate_template_summaries(
+            [f"Test resume for {role}" for role in roles], role_scores_list
+        )
+        for role, role_scores, result in zip(roles, role_scores_list, results):
+            with self.subTest(role=role):
+                self.assertEqual(result['method'], 'template')
+                self.assertIn('summary', result)
+                self.assertGreater(len(result['summary']), 50)
+                expected = self.generator.generate_summary(f"Test resume for {role}", role_scores)
+                self.assertEqual(result['summary'], expected['summary'])
+
+    def test_decode_summary(self):
+        """Test the summary is extracted regardless of extra keys in the reply"""
+        decode = generator_module._decode_summary
+        self.assertEqual(decode('{"summary": "I build things.", "tone": null}'), "I build things.")
+        self.assertEqual(decode('{"summary": "I build things.", "tone": "dynamic"}'), "I build things.")
+        self.assertEqual(decode('  Plain text reply. '), "Plain text reply.")
+
+    def test_generate_summary_batch(self):
+        """Test batch generation preserves input order"""
+        roles = ['Builder', 'Enabler', 'Thriver', 'Supportee']
+        items = []
+        for role in roles:
+            role_scores = {r: 0.25 for r in roles}
+            role_scores[role] = 0.5
+            items.append((f"Test resume for {role}", role_scores, ""))
+
+        results = self.generator.generate_summary_batch_sync(items)
+
+        self.assertEqual(len(results), len(roles))
+        for (resume_text, role_scores, _), result in zip(items, results):
+            expected = self.generator.generate_summary(resume_text, role_scores)
+            self.assertEqual(result['summary'], expected['summary'])
+
+    def test_generate_summary_batch_offline(self):
+        """Test Batch API results map back by custom_id, with templates for failed rows"""
+        generator = SummaryGenerator(api_key=None, verbose=False)
+        confident = {'Builder': 0.5, 'Enabler': 0.3, 'Thriver': 0.15, 'Supportee': 0.05}
+        unsure = {'Builder': 0.25, 'Enabler': 0.25, 'Thriver': 0.25, 'Supportee': 0.25}
+        items = [
+            ("Resume A with Python", confident, ""),
+            ("Resume B with Kafka", unsure, ""),
+            ("Resume C with Docker", confident, ""),
+            ("Resume D with Rust", confident, ""),
+        ]
+        # Only the confident resumes are submitted, as custom_ids '0', '1' and '2'
+        output = '\n'.join(json.dumps(row) for row in [
+            {'custom_id': '1', 'error': None, 'response': {'status_code': 200, 'body': {
+                'choices': [{'message': {'content': '{"summary": "One. Two. Three. Four."}'}}],
+                'usage': {'prompt_tokens': 100, 'completion_tokens': 50}
+            }}},
+            {'custom_id': '0', 'error': {'code': 'server_error'}, 'response': None},
+            # A malformed row only falls back for its own resume
+            {'custom_id': '2', 'error': None, 'response': {'status_code': 200, 'body': {
+                'choices': [{'message': {'content': None}}],
+                'usage': {'prompt_tokens': 100, 'completion_tokens': 0}
+            }}},
+        ])
+        uploaded = []
+        
+        def files_create(file, purpose):
+            uploaded.append((file.name, file.read().decode('utf-8').splitlines()))
+            return SimpleNamespace(id='file-in')
+        
+        client = Mock()
+        client.files.create.side_effect = files_create
+        client.files.content.return_value = SimpleNamespace(text=output)
+        client.batches.create.return_value = SimpleNamespace(id='batch-1')
+        client.batches.retrieve.return_value = SimpleNamespace(
+            status='completed', request_counts=SimpleNamespace(total=3), output_file_id='file-out'
+        )
+        generator.client = client
+        
+        results = generator.generate_summary_batch_sync(items, use_batch_api=True)
+        
+        self.assertEqual([result['method'] for result in results], ['template', 'template', 'llm_batch', 'template'])
+        self.assertEqual(results[2]['summary'], 'One. Two. Three. Four.')
+        (batch_path, batch_lines), = uploaded
+        self.assertEqual([json.loads(line)['custom_id'] for line in batch_lines], ['0', '1', '2'])
+        self.assertFalse(os.path.exists(batch_path))
+        
+        # An expired batch falls back to templates for everything
+        client.batches.retrieve.return_value = SimpleNamespace(status='expired')
+        results = generator.generate_summary_batch_sync(items, use_batch_api=True)
+        self.assertEqual([result['method'] for result in results], ['template'] * 4)
+
+    def test_generate_summary_batch_sync_repeated(self):
+        """Test repeated sync batch calls each get a working async client"""
+        generator = SummaryGenerator(api_key='test-key', verbose=False)
+        role_scores = {'Builder': 0.5, 'Enabler': 0.3, 'Thriver': 0.15, 'Supportee': 0.05}
+        
+        with patch('openai.AsyncOpenAI', _FakeAsyncOpenAI):
+            # Distinct resumes per call, so the summary cache can't hide a failure
+            for run in range(2):
+                results = generator.generate_summary_batch_sync([
+                    (f"Resume {run}-{i} with 5 years of Python", role_scores, "") for i in range(3)
+                ])
+                self.assertEqual([result['method'] for result in results], ['llm'] * 3)
             
-            result = self.generator.generate_summary(
-                f"Test resume for {role}",
-                role_scores
-            )
+            # Also works when the caller already has a running event loop
+            async def batch_in_loop():
+                return generator.generate_summary_batch_sync([("Resume in loop", role_scores, "")])
             
-            self.assertEqual(result['method'], 'template')
-            self.assertIn('summary', result)
-            self.assertGreater(len(result['summary']), 50)
+            self.assertEqual(asyncio.run(batch_in_loop())[0]['method'], 'llm')
 
 
 class TestRoleColorPipeline(unittest.TestCase):
     """Test end-to-end pipeline"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        # Mock the scorer to avoid model loading
-        with patch('rolecolorai.scorer.SemanticRoleScorer') as mock_scorer_class:
-            mock_scorer = Mock()
-            mock_scorer.score_resume.return_value = {
-                'scores': {'Builder': 0.5, 'Enabler': 0.3, 'Thriver': 0.15, 'Supportee': 0.05},
-                'dominant_role': 'Builder',
-                'confidence': 0.5,
-                'top_sentences': ['Test sentence 1', 'Test sentence 2'],
-                'total_sentences': 10,
-                'sentences_used': 10
-            }
-            mock_scorer_class.return_value = mock_scorer
-            
-            self.pipeline = RoleColorPipeline(api_key=None)
-            self.pipeline.scorer = mock_scorer
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures"""
+        # Mock the scorer where the pipeline looks it up, once per class, to
+        # avoid model loading
+        patcher = patch('rolecolorai.pipeline.SemanticRoleScorer')
+        mock_scorer_class = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        mock_scorer = Mock()
+        mock_scorer.score_resume.return_value = MappingProxyType({
+            'scores': {'Builder': 0.5, 'Enabler': 0.3, 'Thriver': 0.15, 'Supportee': 0.05},
+            'dominant_role': 'Builder',
+            'confidence': 0.5,
+            'top_sentences': ['Test sentence 1', 'Test sentence 2'],
+            'total_sentences': 10,
+            'sentences_used': 10
+        })
+        mock_scorer_class.return_value = mock_scorer
+        
+        cls.pipeline = RoleColorPipeline(api_key=None)
     
     def test_extract_original_summary(self):
         """Test original summary extraction"""
-        resume = """John Doe
-Software Engineer
-
-Summary:
-Experienced software engineer with 5 years in backend development.
-Skilled in Python and microservices.
-
-Professional Experience:
-Worked at various companies..."""
-        
-        summary = self.pipeline._extract_original_summary(resume)
+        summary = self.pipeline._extract_original_summary(_RESUME_SUMMARY)
         # The function should extract the summary lines
         # It looks for "experience" in lowercase, so "Professional Experience:" will trigger break
         # But "Summary:" line itself is skipped, so we get the next lines
@@ -188,18 +595,7 @@ Worked at various companies..."""
     
     def test_analyze_resume(self):
         """Test full resume analysis"""
-        resume_text = """
-        Software Engineer
-        
-        Summary:
-        Experienced engineer with Python and AWS skills.
-        
-        Experience:
-        - Built scalable systems
-        - Led technical initiatives
-        """
-        
-        result = self.pipeline.analyze_resume(resume_text)
+        result = self.pipeline.analyze_resume(_RESUME_ANALYZE)
         
         self.assertIn('rolecolor_scores', result)
         self.assertIn('dominant_role', result)
@@ -207,26 +603,70 @@ Worked at various companies..."""
         self.assertIn('original_summary', result)
         self.assertEqual(result['dominant_role'], 'Builder')
 
+    def test_analyze_resume_llm_overlap(self):
+        """Test the LLM path is repeatable and callable from a running event loop"""
+        core = {
+            'scores': {'Builder': 0.5, 'Enabler': 0.3, 'Thriver': 0.15, 'Supportee': 0.05},
+            'dominant_role': 'Builder',
+            'confidence': 0.5,
+            'total_sentences': 10,
+            'sentences_used': 10
+        }
+        
+        def score_resume(resume_text, on_core=None):
+            on_core(core)
+            return {**core, 'top_sentences': ['Test sentence 1']}
+        
+        client = Mock()
+        client.chat.completions.create.return_value = _chat_response('{"summary": "One. Two. Three. Four."}')
+        
+        async def analyze_in_loop(resume_text):
+            return self.pipeline.analyze_resume(resume_text)
+        
+        with patch.object(self.pipeline.generator, 'client', client), \
+                patch.object(self.pipeline.scorer, 'score_resume', side_effect=score_resume):
+            results = [
+                self.pipeline.analyze_resume(_RESUME_ANALYZE),
+                self.pipeline.analyze_resume(_RESUME_SUMMARY),
+                asyncio.run(analyze_in_loop(_RESUME_EXTRACT)),
+            ]
+        
+        self.assertEqual([result['generation_method'] for result in results], ['llm'] * 3)
+
+    def test_analyze_resumes(self):
+        """Test batch analysis matches analyze_resume, errors included"""
+        texts = [_RESUME_LONG, _RESUME_ANALYZE, _RESUME_LONG_VARIANT]
+
+        with patch.object(self.pipeline, 'scorer', _fake_model_scorer()):
+            results = self.pipeline.analyze_resumes(texts)
+            expected = [self.pipeline.analyze_resume(text) for text in texts]
+
+        self.assertEqual(results, expected)
+        self.assertEqual(set(results[1]), {'error', 'scores'})
+        for result in (results[0], results[2]):
+            self.assertEqual(result['generation_method'], 'template')
+            self.assertGreater(len(result['rewritten_summary']), 50)
+            self.assertEqual(len(result['sentence_scores']), result['metadata']['total_sentences'])
+
 
 class TestUtilityFunctions(unittest.TestCase):
     """Test utility functions"""
     
     def test_load_resume_from_file(self):
         """Test loading resume from file"""
-        # Create a temporary test file
-        test_file = 'test_resume_temp.txt'
+        # Create a temporary test file (memory-backed /dev/shm when available)
         test_content = "This is a test resume content."
+        tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        with tempfile.NamedTemporaryFile('w', dir=tmp_dir, suffix='.txt', delete=False) as f:
+            f.write(test_content)
+            test_file = f.name
         
         try:
-            with open(test_file, 'w') as f:
-                f.write(test_content)
-            
             loaded = load_resume_from_file(test_file)
             self.assertEqual(loaded, test_content)
         finally:
             # Clean up
-            if os.path.exists(test_file):
-                os.remove(test_file)
+            os.remove(test_file)
     
     def test_load_resume_from_file_not_found(self):
         """Test error handling for missing file"""
@@ -241,26 +681,21 @@ class TestRoleDefinitions(unittest.TestCase):
         """Test that all 4 roles are defined"""
         expected_roles = {'Builder', 'Enabler', 'Thriver', 'Supportee'}
         self.assertEqual(set(ROLE_DEFINITIONS.keys()), expected_roles)
+        with self.assertRaises(TypeError):
+            ROLE_DEFINITIONS['Builder'] = ''
     
     def test_role_definitions_not_empty(self):
         """Test that role definitions are not empty"""
-        for role, definition in ROLE_DEFINITIONS.items():
-            self.assertGreater(len(definition.strip()), 10)
-            self.assertIsInstance(definition, str)
+        self.assertTrue(
+            all(isinstance(v, str) for v in ROLE_DEFINITIONS.values()) and min(ROLE_DEFINITION_LENGTHS) > 10
+        )
 
 
 def run_tests():
     """Run all tests"""
-    # Create test suite
+    # Create test suite from every test class in this module
     loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestSemanticRoleScorer))
-    suite.addTests(loader.loadTestsFromTestCase(TestSummaryGenerator))
-    suite.addTests(loader.loadTestsFromTestCase(TestRoleColorPipeline))
-    suite.addTests(loader.loadTestsFromTestCase(TestUtilityFunctions))
-    suite.addTests(loader.loadTestsFromTestCase(TestRoleDefinitions))
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)